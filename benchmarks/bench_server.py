@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+
+"""
+Server benchmark - many local telnet clients typing at once
+
+Starts a TypingServer in-process and connects simulated typists over local
+sockets. Reports server CPU use and checks every session saved its result:
+
+    python -m benchmarks.bench_server --clients 300 --time 10
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+
+# Import custom modules
+from core.session.result_manager import ResultManager
+from server.telnet import IAC, NAWS, SB, SE
+from server.typing_server import TypingServer
+
+async def typist(port, time_limit, wpm, seed):
+    """Connect, type random letters at ``wpm`` until the test ends, then leave."""
+    rng = random.Random(seed)
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(bytes([IAC, SB, NAWS, 0, 100, 0, 30, IAC, SE]))
+
+    received = 0
+
+    async def drain_screen():
+        nonlocal received
+        while True:
+            data = await reader.read(65536)
+            if not data:
+                return
+            received += len(data)
+
+    reading = asyncio.create_task(drain_screen())
+
+    interval = 60 / (wpm * 5)
+    deadline = time.monotonic() + time_limit + 0.5
+    while time.monotonic() < deadline:
+        word = "".join(rng.choice("etaoinshrdlu") for _ in range(rng.randint(2, 7)))
+        for char in word + " ":
+            writer.write(char.encode())
+            await asyncio.sleep(interval)
+
+    # Leave the results screen
+    writer.write(b"\x1b")
+    await writer.drain()
+    await asyncio.wait_for(reading, 10)
+    writer.close()
+    return received
+
+async def run(clients, time_limit, wpm):
+    with tempfile.TemporaryDirectory() as history_dir:
+        result_manager = ResultManager(history_dir)
+        server = TypingServer(port=0, time_limit=time_limit, result_manager=result_manager)
+        await server.start()
+        port = server.server.sockets[0].getsockname()[1]
+
+        cpu_started, wall_started = time.process_time(), time.monotonic()
+        received = await asyncio.gather(*(typist(port, time_limit, wpm, seed) for seed in range(clients)))
+        cpu, wall = time.process_time() - cpu_started, time.monotonic() - wall_started
+
+        await server.close()
+        saved = sum(1 for _ in result_manager.get_history())
+
+    print(f"clients          {clients}")
+    print(f"wall time        {wall:.1f}s")
+    print(f"process CPU      {cpu:.1f}s ({cpu / wall:.0%} of one core, clients included)")
+    print(f"screen bytes     {sum(received) / clients:,.0f} per client")
+    print(f"results saved    {saved}/{clients}")
+    return saved == clients
+
+def main():
+    parser = argparse.ArgumentParser(description='Typing server benchmark')
+    parser.add_argument('--clients', type=int, default=100,
+                        help='Concurrent simulated typists (default: 100)')
+    parser.add_argument('--time', type=int, default=10,
+                        help='Session time limit in seconds (default: 10)')
+    parser.add_argument('--wpm', type=int, default=80,
+                        help='Typing speed of each client (default: 80)')
+    args = parser.parse_args()
+
+    return 0 if asyncio.run(run(args.clients, args.time, args.wpm)) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
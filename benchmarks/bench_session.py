@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+
+"""
+Session benchmarks - throughput of the typing core and the session screen
+
+Runs headless through a ManualClock and a FakeWindow, so it works in CI:
+
+    python -m benchmarks.bench_session --min-keys-per-second 50000 --min-fps 2000
+"""
+
+import argparse
+import itertools
+import sys
+import time
+
+# Import custom modules
+from core.session.replay import ManualClock, replay, synthetic_keystrokes
+from core.session.typing_session import TypingSession
+from ui.headless import FakeWindow
+from ui.screens.session.interface import SessionInterface
+
+WPM = 80
+
+def time_limit_for(keys):
+    """A time limit long enough to type ``keys`` keys at WPM."""
+    return int(keys * 60 / (WPM * 5)) + 60
+
+def bench_core(keys, seed=0):
+    """Return keys/second through process_key() and update_stats()."""
+    clock = ManualClock()
+    typing_session = TypingSession(time_limit=time_limit_for(keys), clock=clock)
+    typing_session.start()
+
+    keystrokes = list(itertools.islice(synthetic_keystrokes(typing_session, WPM, seed=seed), keys))
+
+    started = time.perf_counter()
+    replay(typing_session, keystrokes, clock)
+    return keys / (time.perf_counter() - started)
+
+def bench_draw(height, width, frames, seed=0):
+    """Return (frames/second, terminal bytes/frame) for SessionInterface.draw()."""
+    clock = ManualClock()
+    typing_session = TypingSession(time_limit=time_limit_for(frames), clock=clock)
+    typing_session.start()
+
+    window = FakeWindow(height, width)
+    interface = SessionInterface(typing_session, window)
+    keystrokes = list(itertools.islice(synthetic_keystrokes(typing_session, WPM, seed=seed), frames))
+
+    started = time.perf_counter()
+    replay(typing_session, keystrokes, clock, interface)
+    elapsed = time.perf_counter() - started
+
+    return frames / elapsed, window.bytes_written / frames
+
+def parse_size(size):
+    width, height = size.lower().split("x")
+    return int(height), int(width)
+
+def main():
+    parser = argparse.ArgumentParser(description='Headless session benchmarks')
+    parser.add_argument('--keys', type=int, default=100_000,
+                        help='Keystrokes fed through the core (default: 100000)')
+    parser.add_argument('--frames', type=int, default=5_000,
+                        help='Frames drawn per terminal size (default: 5000)')
+    parser.add_argument('--sizes', type=str, default="80x24,120x40,240x70",
+                        help='Comma separated WIDTHxHEIGHT terminal sizes')
+    parser.add_argument('--min-keys-per-second', type=float, default=0,
+                        help='Fail if the core is slower than this')
+    parser.add_argument('--min-fps', type=float, default=0,
+                        help='Fail if any terminal size draws slower than this')
+    args = parser.parse_args()
+
+    failed = False
+
+    keys_per_second = bench_core(args.keys)
+    print(f"core       {keys_per_second:12,.0f} keys/s")
+    if keys_per_second < args.min_keys_per_second:
+        print(f"  below the {args.min_keys_per_second:,.0f} keys/s budget")
+        failed = True
+
+    for size in args.sizes.split(","):
+        height, width = parse_size(size)
+        fps, bytes_per_frame = bench_draw(height, width, args.frames)
+        print(f"draw {size:>7} {fps:12,.0f} frames/s {bytes_per_frame:8.1f} bytes/frame")
+        if fps < args.min_fps:
+            print(f"  below the {args.min_fps:,.0f} frames/s budget")
+            failed = True
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+
+"""
+Startup benchmark - import cost and time to the first session frame
+
+Reports the slowest imports (as with ``python -X importtime``) and the wall
+time from launching main.py in a pseudo-terminal until the session header is
+on screen. POSIX only, because of the pty:
+
+    python -m benchmarks.bench_startup --import-budget-ms 60 --budget-ms 250
+"""
+
+import argparse
+import os
+import select
+import signal
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+FIRST_FRAME_MARKER = b"Shelltyping Session"
+
+def import_times(module="main"):
+    """Return [(cumulative µs, module)] for importing ``module``, slowest first."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+
+    times = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times.append((int(cumulative), name.strip()))
+    return sorted(times, reverse=True)
+
+def time_to_first_frame(args=("-t", "5"), timeout=10.0):
+    """Seconds from spawning main.py in a pty until the session header shows."""
+    import pty
+
+    started = time.perf_counter()
+    pid, fd = pty.fork()
+    if pid == 0:
+        os.chdir(ROOT)
+        os.environ.setdefault("TERM", "xterm")
+        os.execv(sys.executable, [sys.executable, "main.py", *args])
+
+    output = b""
+    try:
+        while time.perf_counter() - started < timeout:
+            ready, _, _ = select.select([fd], [], [], 0.05)
+            if ready:
+                output += os.read(fd, 65536)
+                if FIRST_FRAME_MARKER in output:
+                    return time.perf_counter() - started
+        raise TimeoutError("main.py drew no session frame")
+    finally:
+        os.kill(pid, signal.SIGKILL)
+        os.waitpid(pid, 0)
+        os.close(fd)
+
+def main():
+    parser = argparse.ArgumentParser(description='Startup benchmark')
+    parser.add_argument('--runs', type=int, default=5,
+                        help='Launches to time (default: 5)')
+    parser.add_argument('--top', type=int, default=10,
+                        help='Slowest imports to list (default: 10)')
+    parser.add_argument('--import-budget-ms', type=float, default=0,
+                        help='Fail if importing main takes longer than this')
+    parser.add_argument('--budget-ms', type=float, default=0,
+                        help='Fail if the median time to first frame is longer than this')
+    args = parser.parse_args()
+
+    failed = False
+
+    times = import_times()
+    main_import = dict((name, us) for us, name in times).get("main", 0) / 1000
+    print(f"import main          {main_import:8.1f} ms")
+    for us, name in times[:args.top]:
+        print(f"  {name:<30} {us / 1000:8.1f} ms")
+    if args.import_budget_ms and main_import > args.import_budget_ms:
+        print(f"  over the {args.import_budget_ms} ms import budget")
+        failed = True
+
+    frames = [time_to_first_frame() * 1000 for _ in range(args.runs)]
+    median = statistics.median(frames)
+    print(f"time to first frame  {median:8.1f} ms (median of {args.runs}, min {min(frames):.1f})")
+    if args.budget_ms and median > args.budget_ms:
+        print(f"  over the {args.budget_ms} ms first-frame budget")
+        failed = True
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+
+"""
+Soak test - memory across many restarted rounds in one sitting
+
+Plays rounds back to back through SessionController on a FakeWindow, pressing
+Enter on every results screen, and tracks Python heap use with tracemalloc:
+
+    python -m benchmarks.soak_sessions --rounds 1000 --max-bytes-per-round 512
+"""
+
+import argparse
+import gc
+import itertools
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Import custom modules
+from core.session.replay import ManualClock
+from core.session.result_manager import ResultManager
+from core.session.run_session import ENTER, SessionController
+from ui.headless import FakeWindow
+
+KEY_INTERVAL = 0.15
+"""Seconds between typed keys, 80 WPM"""
+
+class SoakWindow(FakeWindow):
+    """Types a fixed text during rounds and presses Enter on results screens."""
+
+    def __init__(self, clock, rounds, height=24, width=80):
+        super().__init__(height, width)
+        self.clock = clock
+        self.rounds = rounds
+        self.typing = itertools.cycle(b"the quick brown fox jumps over the lazy dog ")
+        self.delay = -1
+
+    def timeout(self, delay):
+        self.delay = delay
+
+    def getch(self):
+        if self.delay < 0:
+            # Blocking getch is the results screen, leave it
+            self.rounds -= 1
+            return ENTER if self.rounds > 0 else 27
+
+        if self.delay == 0:
+            return -1  # Nothing else queued
+        self.clock.advance(KEY_INTERVAL)
+        return next(self.typing)
+
+class SoakController(SessionController):
+    """SessionController without a real terminal."""
+
+    def setup_screen(self):
+        pass
+
+    def update_screen(self):
+        pass
+
+def traced_memory(result_manager):
+    """Python heap in use once pending saves are written and garbage is collected."""
+    result_manager.flush()
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+def soak(rounds, warmup, time_limit, checkpoints=10):
+    """Play warmup + rounds rounds, returning [(rounds played, bytes in use)]."""
+    history_dir = tempfile.mkdtemp(prefix="shelltype-soak-")
+    try:
+        clock = ManualClock()
+        result_manager = ResultManager(history_dir)
+        samples = []
+
+        # Warm up caches (word lists, imports, the history index) before measuring
+        controller = SoakController(SoakWindow(clock, max(warmup, 1)), time_limit,
+                                    result_manager=result_manager, clock=clock)
+        controller.run()
+
+        tracemalloc.start()
+        samples.append((0, traced_memory(result_manager)))
+
+        step = max(rounds // checkpoints, 1)
+        played = 0
+        while played < rounds:
+            count = min(step, rounds - played)
+            controller = SoakController(SoakWindow(clock, count), time_limit,
+                                        result_manager=result_manager, clock=clock)
+            controller.run()
+            played += count
+            samples.append((played, traced_memory(result_manager)))
+
+        tracemalloc.stop()
+        return samples
+    finally:
+        shutil.rmtree(history_dir, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description='Memory soak test for restarted rounds')
+    parser.add_argument('--rounds', type=int, default=1000,
+                        help='Rounds measured (default: 1000)')
+    parser.add_argument('--warmup', type=int, default=20,
+                        help='Rounds played before measuring (default: 20)')
+    parser.add_argument('--time', type=int, default=5,
+                        help='Time limit of each round in seconds (default: 5)')
+    parser.add_argument('--max-bytes-per-round', type=float, default=0,
+                        help='Fail if the heap grows more than this per round')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    samples = soak(args.rounds, args.warmup, args.time)
+    elapsed = time.perf_counter() - started
+
+    for played, in_use in samples:
+        print(f"after {played:6,} rounds {in_use / 1024:10,.1f} KiB")
+
+    # The first checkpoint still includes one-off allocations, measure from there
+    first = samples[1] if len(samples) > 2 else samples[0]
+    growth = (samples[-1][1] - first[1]) / (samples[-1][0] - first[0])
+    print(f"growth          {growth:10,.1f} bytes/round")
+    print(f"wall time       {elapsed:10,.1f}s")
+
+    if args.max_bytes_per_round and growth > args.max_bytes_per_round:
+        print(f"  above the {args.max_bytes_per_round:,.0f} bytes/round budget")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
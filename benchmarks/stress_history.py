@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+
+"""
+History stress test - many processes saving into one history at once
+
+Every process saves results, key stats and keystrokes through its own
+ResultManager, with small segments so rotations race as well, while also
+querying the SQLite index. Afterwards every result must be in the log exactly
+once and in the index exactly once, and every counter and keystroke record
+must add up. Finally another process holds the key stats lock while the
+calls the UI makes must still return at once:
+
+    python -m benchmarks.stress_history --processes 8 --results 2000
+"""
+
+import argparse
+from collections import Counter
+import multiprocessing
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+# Import custom modules
+from core.history.lock import FileLock
+from core.session.result_manager import ResultManager
+
+SEGMENT_SIZE = 16 * 1024
+"""Tiny segments, so processes keep rotating under each other"""
+
+KEYS_PER_SESSION = 20
+
+UI_CALL_LIMIT = 0.05
+"""Seconds a call made from the UI thread may take while another process holds a lock"""
+
+LOCK_HOLD = 2.0
+"""Seconds the contending process holds the key stats lock"""
+
+def save_results(history_dir, worker, results, flush_every):
+    """Save ``results`` results from one process, like that many finished tests."""
+    result_manager = ResultManager(history_dir)
+    result_manager.store.segment_size = SEGMENT_SIZE
+
+    for i in range(results):
+        result_manager.save_result({
+            "date": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "wpm": 60.0,
+            "accuracy": 100.0,
+            "time_limit": 60,
+            "word_source": "common",
+            "elapsed_time": 60.0,
+            "consistency": 80,
+            "worker": worker,
+            "number": i,
+        })
+        result_manager.save_key_stats([("a", 1, 0, 0.2, 0.04)])
+        result_manager.save_keystrokes(
+            ((n * 100_000_000, 97) for n in range(1, KEYS_PER_SESSION + 1)), 0)
+
+        if (i + 1) % flush_every == 0:
+            result_manager.flush()
+            try:
+                result_manager.index.count()  # Query the index while others sync it
+            except sqlite3.OperationalError:
+                pass  # Busy past the read timeout, like a results screen skipping its rank
+
+    result_manager.flush()
+    return list(result_manager.errors)
+
+def check(history_dir, processes, results):
+    """Return a list of problems found in the history after the run."""
+    problems = []
+    expected = processes * results
+    result_manager = ResultManager(history_dir)
+
+    saved = Counter((record["worker"], record["number"]) for record in result_manager.get_history())
+    missing = expected - len(saved)
+    duplicated = sum(count - 1 for count in saved.values() if count > 1)
+    if missing or duplicated or any(not (0 <= number < results) for _, number in saved):
+        problems.append(f"log: {len(saved):,} distinct results, {missing:,} missing, {duplicated:,} duplicated")
+
+    indexed = result_manager.index.count()
+    if indexed != expected:
+        problems.append(f"index: {indexed:,} results, expected {expected:,}")
+
+    presses = result_manager.key_stats.load().get("a", [0])[0]
+    if presses != expected:
+        problems.append(f"key stats: {presses:,} presses, expected {expected:,}")
+
+    archive = result_manager.keylog
+    sessions = broken = 0
+    for entry in archive.entries():
+        sessions += 1
+        keys = list(archive.keystrokes(entry))
+        if len(keys) != KEYS_PER_SESSION or any(key != 97 for _, key in keys):
+            broken += 1
+    archive.close()
+    if sessions != expected or broken:
+        problems.append(f"keystrokes: {sessions:,} sessions, expected {expected:,}, {broken:,} corrupt")
+
+    return problems
+
+def hold_lock(lock_file, locked, seconds):
+    """Hold a lock from another process, like a second shelltype merging key stats."""
+    with FileLock(lock_file):
+        locked.set()
+        time.sleep(seconds)
+
+def check_ui_calls(history_dir):
+    """Return problems with UI-side calls that waited on a lock held elsewhere."""
+    problems = []
+    result_manager = ResultManager(history_dir)
+    locked = multiprocessing.Event()
+    holder = multiprocessing.Process(target=hold_lock,
+                                     args=(result_manager.key_stats.lock_file, locked, LOCK_HOLD))
+    holder.start()
+    try:
+        locked.wait()
+        slowest = {"save_key_stats": 0.0, "weak_keys": 0.0}
+        for _ in range(5):
+            # The first merge blocks on the lock, the calls after it run while it waits
+            started = time.perf_counter()
+            result_manager.save_key_stats([("a", 1, 0, 0.2, 0.04)])
+            slowest["save_key_stats"] = max(slowest["save_key_stats"], time.perf_counter() - started)
+
+            started = time.perf_counter()
+            result_manager.weak_keys()
+            slowest["weak_keys"] = max(slowest["weak_keys"], time.perf_counter() - started)
+            time.sleep(0.1)
+    finally:
+        holder.join()
+    result_manager.flush()
+
+    for call, seconds in slowest.items():
+        print(f"{call:<15} {seconds * 1000:10,.2f}ms slowest with the key stats lock held")
+        if seconds > UI_CALL_LIMIT:
+            problems.append(f"{call} took {seconds:.2f}s with the key stats lock held elsewhere")
+    return problems + list(result_manager.errors)
+
+def main():
+    parser = argparse.ArgumentParser(description='Concurrent history writes stress test')
+    parser.add_argument('--processes', type=int, default=8,
+                        help='Processes saving at once (default: 8)')
+    parser.add_argument('--results', type=int, default=1000,
+                        help='Results saved per process (default: 1000)')
+    parser.add_argument('--flush-every', type=int, default=25,
+                        help='Results queued before a process waits for its writer (default: 25)')
+    args = parser.parse_args()
+
+    history_dir = tempfile.mkdtemp(prefix="shelltype-stress-")
+    try:
+        started = time.perf_counter()
+        with multiprocessing.Pool(args.processes) as pool:
+            errors = pool.starmap(save_results, [
+                (history_dir, worker, args.results, args.flush_every)
+                for worker in range(args.processes)
+            ])
+        elapsed = time.perf_counter() - started
+
+        total = args.processes * args.results
+        print(f"processes       {args.processes:10,}")
+        print(f"results saved   {total:10,}")
+        print(f"wall time       {elapsed:10,.1f}s ({total / elapsed:,.0f} results/s)")
+
+        problems = [error for worker_errors in errors for error in worker_errors]
+        problems += check(history_dir, args.processes, args.results)
+        problems += check_ui_calls(history_dir)
+        for problem in problems:
+            print(f"  {problem}")
+        print("FAILED" if problems else "OK")
+        return 1 if problems else 0
+    finally:
+        shutil.rmtree(history_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,2 +1,2 @@
-from colors import COLOR_YELLOW, COLOR_GREEN, COLOR_RED
-from padding import PADDING_Y, PADDING_X
+from .padding import PADDING_Y, PADDING_X
+from .timing import MAX_FPS
@@ -1,10 +1,25 @@
 """
 This module defines color constants.
 Make sure to update this if you change the color scheme in the main.py.
+
+The attributes are looked up on first use, since color_pair() only works once
+curses is initialized. Without a terminal (headless windows) they are 0.
 """
 
-from curses import color_pair
+import curses
+
+COLOR_PAIRS = {
+    "CURRENT_CHARACTER": 1,
+    "CORRECT_CHARACTER": 2,
+    "INCORRECT_CHARACTER": 3,
+}
 
-CURRENT_CHARACTER = color_pair(1)
-CORRECT_CHARACTER = color_pair(2)
-INCORRECT_CHARACTER = color_pair(3)
+def __getattr__(name):
+    if name not in COLOR_PAIRS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        value = curses.color_pair(COLOR_PAIRS[name])
+    except curses.error:
+        return 0  # Curses isn't initialized, e.g. on a headless window
+    globals()[name] = value
+    return value
@@ -0,0 +1,2 @@
+MAX_FPS = 60
+"""Default cap on redraws per second (0 disables the cap)"""
@@ -0,0 +1,14 @@
+"""
+History package - the exports are imported on first use to keep startup fast
+"""
+
+from utils.lazy_exports import lazy_exports
+
+__getattr__ = lazy_exports(__name__, {
+    "HistoryStore": ".store",
+    "HistoryIndex": ".index",
+    "HistoryAnalytics": ".analytics",
+    "KeyStatsStore": ".key_stats",
+    "KeylogArchive": ".keylog",
+    "BackgroundWriter": ".writer",
+})
@@ -0,0 +1,168 @@
+"""
+History analytics - vectorized statistics over the result history
+
+Requires NumPy, which is optional for the rest of the application.
+"""
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SECONDS_PER_WEEK = 7 * 24 * 60 * 60
+
+class HistoryAnalytics:
+    """Columnar NumPy view of the history in a HistoryIndex.
+
+    Results are loaded once into one array per field and only new rows are
+    appended on ``refresh()``, so every statistic is a handful of vectorized
+    operations over arrays already in memory.
+    """
+
+    def __init__(self, index):
+        if np is None:
+            raise ImportError("History analytics require numpy (pip install numpy)")
+
+        self.index = index
+        self.last_id = 0
+
+        self.time = np.empty(0, dtype=np.int64)  # Unix seconds
+        self.wpm = np.empty(0, dtype=np.float64)
+        self.accuracy = np.empty(0, dtype=np.float64)
+        self.consistency = np.empty(0, dtype=np.float64)
+        self.time_limit = np.empty(0, dtype=np.int32)
+        self.source = np.empty(0, dtype=np.int16)  # Index into self.sources
+        self.sources = []
+
+        self.refresh()
+
+    def __len__(self):
+        return len(self.wpm)
+
+    def refresh(self):
+        """Append results saved since the last refresh."""
+        rows = self.index.columns_since(self.last_id)
+        if not rows:
+            return
+
+        ids, times, wpm, accuracy, consistency, time_limit, sources = zip(*rows)
+        codes = [self._source_code(source) for source in sources]
+
+        self.time = np.concatenate([self.time, np.array(times, dtype=np.int64)])
+        self.wpm = np.concatenate([self.wpm, np.array(wpm, dtype=np.float64)])
+        self.accuracy = np.concatenate([self.accuracy, np.array(accuracy, dtype=np.float64)])
+        self.consistency = np.concatenate([self.consistency, np.array(consistency, dtype=np.float64)])
+        self.time_limit = np.concatenate([self.time_limit, np.array(time_limit, dtype=np.int32)])
+        self.source = np.concatenate([self.source, np.array(codes, dtype=np.int16)])
+        self.last_id = ids[-1]
+
+    def _source_code(self, source):
+        if source not in self.sources:
+            self.sources.append(source)
+        return self.sources.index(source)
+
+    def mask(self, word_source=None, time_limit=None):
+        """Boolean mask selecting one mode, or everything."""
+        mask = np.ones(len(self), dtype=bool)
+        if word_source is not None:
+            code = self.sources.index(word_source) if word_source in self.sources else -1
+            mask &= self.source == code
+        if time_limit is not None:
+            mask &= self.time_limit == time_limit
+        return mask
+
+    def column(self, name="wpm", word_source=None, time_limit=None):
+        """Values of a field for one mode, oldest first, NaNs removed."""
+        values = getattr(self, name)[self.mask(word_source, time_limit)]
+        return values[~np.isnan(values)]
+
+    def rolling_average(self, name="wpm", window=10, word_source=None, time_limit=None):
+        """Mean of each ``window`` consecutive results."""
+        values = self.column(name, word_source, time_limit)
+        if len(values) < window:
+            return np.empty(0)
+        sums = np.cumsum(np.insert(values, 0, 0.0))
+        return (sums[window:] - sums[:-window]) / window
+
+    def percentiles(self, name="wpm", q=(50, 90, 99), word_source=None, time_limit=None):
+        """Percentiles of a field as {q: value}."""
+        values = self.column(name, word_source, time_limit)
+        if not len(values):
+            return {}
+        return dict(zip(q, np.percentile(values, q).tolist()))
+
+    def percentile_rank(self, value, name="wpm", word_source=None, time_limit=None):
+        """Percentage of results strictly below ``value``."""
+        values = self.column(name, word_source, time_limit)
+        if not len(values):
+            return 0.0
+        return float(np.count_nonzero(values < value) / len(values) * 100)
+
+    def improvement_rate(self, word_source=None, time_limit=None):
+        """Least-squares slope of WPM over time, in WPM per week."""
+        mask = self.mask(word_source, time_limit) & ~np.isnan(self.wpm)
+        if np.count_nonzero(mask) < 2:
+            return 0.0
+
+        weeks = (self.time[mask] - self.time[mask][0]) / SECONDS_PER_WEEK
+        wpm = self.wpm[mask]
+        weeks_centered = weeks - weeks.mean()
+        denominator = np.dot(weeks_centered, weeks_centered)
+        if denominator == 0:
+            return 0.0
+        return float(np.dot(weeks_centered, wpm - wpm.mean()) / denominator)
+
+    def mode_trends(self):
+        """Sessions, mean WPM and WPM/week slope for every mode at once.
+
+        Returns a list of dicts, one per (word_source, time_limit) mode.
+        """
+        valid = ~np.isnan(self.wpm)
+        if not np.any(valid):
+            return []
+
+        # Group by a single integer key per mode
+        keys = self.source[valid].astype(np.int64) << 32 | self.time_limit[valid].astype(np.int64)
+        modes, group = np.unique(keys, return_inverse=True)
+
+        weeks = (self.time[valid] - self.time[valid].min()) / SECONDS_PER_WEEK
+        wpm = self.wpm[valid]
+
+        count = np.bincount(group)
+        sum_t = np.bincount(group, weeks)
+        sum_w = np.bincount(group, wpm)
+        sum_tt = np.bincount(group, weeks * weeks)
+        sum_tw = np.bincount(group, weeks * wpm)
+
+        variance_t = sum_tt - sum_t * sum_t / count
+        covariance = sum_tw - sum_t * sum_w / count
+        slope = np.divide(covariance, variance_t, out=np.zeros_like(covariance), where=variance_t > 0)
+
+        return [
+            {
+                "word_source": self.sources[mode >> 32],
+                "time_limit": int(mode & 0xFFFFFFFF),
+                "sessions": int(n),
+                "avg_wpm": float(total / n),
+                "wpm_per_week": float(s),
+            }
+            for mode, n, total, s in zip(modes.tolist(), count, sum_w, slope)
+        ]
+
+    def outliers(self, name="wpm", threshold=3.5, word_source=None, time_limit=None):
+        """Positions (in the mode's results) whose modified z-score exceeds ``threshold``.
+
+        Uses the median absolute deviation, so the outliers themselves don't
+        hide in an inflated standard deviation.
+        """
+        values = self.column(name, word_source, time_limit)
+        if not len(values):
+            return np.empty(0, dtype=np.int64)
+
+        median = np.median(values)
+        mad = np.median(np.abs(values - median))
+        if mad == 0:
+            return np.empty(0, dtype=np.int64)
+
+        scores = 0.6745 * (values - median) / mad
+        return np.flatnonzero(np.abs(scores) > threshold)
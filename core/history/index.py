@@ -0,0 +1,184 @@
+"""
+History index - SQLite mirror of the history log for fast queries
+"""
+
+import sqlite3
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    wpm REAL,
+    accuracy REAL,
+    consistency REAL,
+    time_limit INTEGER,
+    word_source TEXT,
+    elapsed_time REAL,
+    week TEXT
+);
+CREATE INDEX IF NOT EXISTS results_date ON results (date);
+CREATE INDEX IF NOT EXISTS results_wpm ON results (wpm);
+CREATE INDEX IF NOT EXISTS results_mode ON results (word_source, time_limit, wpm);
+CREATE INDEX IF NOT EXISTS results_time_limit ON results (time_limit, wpm);
+CREATE INDEX IF NOT EXISTS results_week ON results (week, word_source, time_limit, wpm, accuracy);
+CREATE INDEX IF NOT EXISTS results_mode_week ON results (word_source, time_limit, week, wpm, accuracy);
+
+CREATE TABLE IF NOT EXISTS sync (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    segment INTEGER NOT NULL,
+    offset INTEGER NOT NULL
+);
+"""
+
+COLUMNS = ("date", "wpm", "accuracy", "consistency", "time_limit", "word_source", "elapsed_time")
+
+SORTABLE = {"date", "wpm", "accuracy", "consistency", "time_limit", "elapsed_time"}
+
+BATCH_SIZE = 1000
+
+READ_TIMEOUT = 0.25
+"""Seconds a query waits for another connection to finish committing"""
+
+SYNC_TIMEOUT = 30.0
+"""Seconds a writer waits for the index write lock"""
+
+class HistoryIndex:
+    """Queryable SQLite index over a HistoryStore.
+
+    The history log stays the source of truth. The index remembers the log
+    position it has ingested up to and picks up new records before every
+    query, so filtering, sorting and aggregation all run inside SQLite.
+
+    Queries never wait for the write lock: when another connection is
+    syncing they answer from the index as it was last synced. The history
+    writer keeps it current by syncing after every append.
+    """
+
+    def __init__(self, store, db_path, timeout=READ_TIMEOUT, check_same_thread=True):
+        self.store = store
+        self.db_path = db_path
+
+        self.connection = sqlite3.connect(db_path, timeout=timeout, check_same_thread=check_same_thread)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+
+    def close(self):
+        self.connection.close()
+
+    def _position(self):
+        row = self.connection.execute("SELECT segment, offset FROM sync WHERE id = 0").fetchone()
+        return (row["segment"], row["offset"]) if row else (0, 0)
+
+    def sync(self, wait=True):
+        """Ingest records appended to the log since the last sync.
+
+        With ``wait=False`` the sync is skipped when another connection holds
+        the write lock for longer than the connection's timeout.
+        """
+        new_records = self.store.records_since(self._position())
+        if next(new_records, None) is None:
+            return
+        new_records.close()
+
+        batch = []
+        with self.connection:
+            # Other processes sync the same log, take the write lock before reading the position
+            try:
+                self.connection.execute("BEGIN IMMEDIATE")
+            except sqlite3.OperationalError:
+                if wait:
+                    raise
+                return  # Someone else is ingesting the same records
+            position = self._position()
+            for record, position in self.store.records_since(position):
+                batch.append((record.get("date", ""),) + tuple(record.get(column) for column in COLUMNS[1:]))
+                if len(batch) >= BATCH_SIZE:
+                    self._insert(batch, position)
+                    batch = []
+            self._insert(batch, position)
+
+    def _insert(self, batch, position):
+        if batch:
+            # The week is stored so weekly aggregates can group on an index
+            self.connection.executemany(
+                f"INSERT INTO results ({', '.join(COLUMNS)}, week) "
+                f"VALUES ({', '.join('?' * len(COLUMNS))}, strftime('%Y-%W', ?1))",
+                batch,
+            )
+        self.connection.execute(
+            "INSERT OR REPLACE INTO sync (id, segment, offset) VALUES (0, ?, ?)", position
+        )
+
+    def _where(self, word_source=None, time_limit=None, since=None, until=None):
+        """Build a WHERE clause and its parameters from the common filters."""
+        clauses, params = [], []
+        if word_source is not None:
+            clauses.append("word_source = ?")
+            params.append(word_source)
+        if time_limit is not None:
+            clauses.append("time_limit = ?")
+            params.append(time_limit)
+        if since is not None:
+            clauses.append("date >= ?")
+            params.append(since)
+        if until is not None:
+            clauses.append("date < ?")
+            params.append(until)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where, params
+
+    def query(self, word_source=None, time_limit=None, since=None, until=None,
+              order_by="date", descending=True, limit=None, offset=0):
+        """Return matching results as dicts.
+
+        ``since`` and ``until`` are dates in the history format
+        (``YYYY-MM-DD[ HH:MM:SS]``), ``until`` being exclusive.
+        """
+        if order_by not in SORTABLE:
+            raise ValueError(f"Cannot sort history by {order_by!r}")
+
+        self.sync(wait=False)
+        where, params = self._where(word_source, time_limit, since, until)
+        sql = (f"SELECT {', '.join(COLUMNS)} FROM results {where} "
+               f"ORDER BY {order_by} {'DESC' if descending else 'ASC'}, id "
+               f"LIMIT ? OFFSET ?")
+        params += [limit if limit is not None else -1, offset]
+
+        return [dict(row) for row in self.connection.execute(sql, params)]
+
+    def count(self, word_source=None, time_limit=None, since=None, until=None):
+        """Return the number of matching results."""
+        self.sync(wait=False)
+        where, params = self._where(word_source, time_limit, since, until)
+        return self.connection.execute(f"SELECT COUNT(*) FROM results {where}", params).fetchone()[0]
+
+    def personal_bests(self, n=10, word_source=None, time_limit=None):
+        """Return the top ``n`` results by WPM."""
+        return self.query(word_source, time_limit, order_by="wpm", limit=n)
+
+    def weekly_averages(self, word_source=None, time_limit=None, since=None, until=None):
+        """Return average WPM, accuracy and session count per mode per week.
+
+        A mode is a (word_source, time_limit) pair, weeks are ``YYYY-WW``.
+        """
+        self.sync(wait=False)
+        where, params = self._where(word_source, time_limit, since, until)
+        sql = (f"SELECT week, word_source, time_limit, "
+               f"COUNT(*) AS sessions, AVG(wpm) AS avg_wpm, AVG(accuracy) AS avg_accuracy, "
+               f"MAX(wpm) AS best_wpm "
+               f"FROM results {where} "
+               f"GROUP BY week, word_source, time_limit "
+               f"ORDER BY week, word_source, time_limit")
+
+        return [dict(row) for row in self.connection.execute(sql, params)]
+
+    def columns_since(self, last_id=0):
+        """Return (id, unix time, wpm, accuracy, consistency, time_limit, word_source)
+        rows added after ``last_id``, in insertion order."""
+        self.sync(wait=False)
+        return self.connection.execute(
+            "SELECT id, COALESCE(CAST(strftime('%s', date) AS INTEGER), 0), wpm, accuracy, "
+            "consistency, COALESCE(time_limit, 0), word_source FROM results WHERE id > ? ORDER BY id",
+            (last_id,),
+        ).fetchall()
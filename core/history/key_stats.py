@@ -0,0 +1,73 @@
+"""
+Key stats - lifetime per-character error and speed aggregates
+"""
+
+import json
+import os
+
+from .lock import FileLock
+from .store import fsync_dir
+
+class KeyStatsStore:
+    """Small JSON file of additive per-character counters.
+
+    Each character maps to ``[presses, errors, latency sum, latency sum of
+    squares]``. Sessions are merged in by adding their counters, so lifetime
+    error rates and latency mean/deviation never need a pass over the history.
+    Merges hold ``<path>.lock`` so concurrent processes don't lose updates.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.lock_file = f"{path}.lock"
+
+    def load(self):
+        """Return {char: [presses, errors, latency_sum, latency_sq]}."""
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f).get("keys", {})
+        except FileNotFoundError:
+            return {}
+
+    def merge(self, char_stats):
+        """Add (char, presses, errors, latency_sum, latency_sq) rows to the totals.
+
+        Returns the totals as written, including other processes' merges.
+        """
+        with FileLock(self.lock_file):
+            return self._merge(char_stats)
+
+    def _merge(self, char_stats):
+        totals = self.load()
+        for char, *counters in char_stats:
+            current = totals.get(char, [0, 0, 0.0, 0.0])
+            totals[char] = [a + b for a, b in zip(current, counters)]
+
+        # Write a new file and rename it over the old one, never a half-written file
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump({"version": 1, "keys": totals}, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+        fsync_dir(os.path.dirname(self.path))
+        return totals
+
+    def weak_keys(self, count=8, min_presses=10, pending=(), totals=None):
+        """Characters with the highest lifetime error rate, as (char, error %) pairs.
+
+        ``pending`` rows, e.g. a session still queued for ``merge``, are counted too.
+        ``totals`` are used instead of loading the file, they aren't modified.
+        """
+        totals = dict(totals) if totals is not None else self.load()
+        for char, presses, errors, *_ in pending:
+            current = totals.get(char, [0, 0, 0.0, 0.0])
+            totals[char] = [current[0] + presses, current[1] + errors, *current[2:]]
+
+        rates = [
+            (char, errors / presses * 100)
+            for char, (presses, errors, _, _) in totals.items()
+            if presses >= min_presses and errors
+        ]
+        rates.sort(key=lambda rate: rate[1], reverse=True)
+        return rates[:count]
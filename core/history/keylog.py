@@ -0,0 +1,191 @@
+"""
+Keystroke log - compact binary archive of every session's raw keystrokes
+"""
+
+from collections import namedtuple
+import mmap
+import os
+import re
+import struct
+
+from .lock import FileLock
+from .store import fsync_dir
+
+SEGMENT_SIZE = 4 * 1024 * 1024
+"""Size in bytes after which new sessions go to the next segment"""
+
+INDEX_ENTRY = struct.Struct("<dIIII")
+"""Index entry: start (epoch seconds), segment, offset, length, keys"""
+
+KeylogEntry = namedtuple("KeylogEntry", "started segment offset length keys")
+
+def encode_varint(value, out):
+    """Append ``value`` to the bytearray ``out``, 7 bits per byte."""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+def encode_keystrokes(keystrokes, start_ns=0):
+    """Encode (timestamp_ns, key) pairs, returning (key count, bytes).
+
+    Each keystroke is the microseconds since the previous one (the first
+    since ``start_ns``) and the key code, both as varints. At typing speed
+    that's 3-4 bytes per key.
+    """
+    out = bytearray()
+    previous = start_ns // 1000
+    count = 0
+    for timestamp_ns, key in keystrokes:
+        timestamp = timestamp_ns // 1000
+        encode_varint(max(timestamp - previous, 0), out)
+        encode_varint(key, out)
+        previous = timestamp
+        count += 1
+    return count, bytes(out)
+
+def decode_keystrokes(data, count):
+    """Yield (seconds since the session started, key) from encoded keystrokes."""
+    position = 0
+    elapsed = 0
+    for _ in range(count):
+        values = []
+        for _ in range(2):
+            value = shift = 0
+            while True:
+                byte = data[position]
+                position += 1
+                value |= (byte & 0x7F) << shift
+                if byte < 0x80:
+                    break
+                shift += 7
+            values.append(value)
+        delta, key = values
+        elapsed += delta
+        yield elapsed / 1_000_000, key
+
+class KeylogArchive:
+    """Append-only archive of raw keystrokes, one record per session.
+
+    Sessions are appended to ``keystrokes.<number>.bin`` segments, a new one
+    starting once the last grows past ``segment_size``, and an entry per
+    session goes to the fixed-size ``keystrokes.idx`` index. Segment bytes are
+    fsynced before their index entry, so a crash at most leaves unreferenced
+    bytes behind. Appends hold ``keystrokes.lock`` so processes sharing the
+    archive don't interleave. Reading memory-maps the index and segments, so
+    scanning years of sessions decodes one session at a time.
+    """
+
+    def __init__(self, archive_dir, segment_size=SEGMENT_SIZE):
+        self.archive_dir = archive_dir
+        self.segment_size = segment_size
+
+        self.index_file = os.path.join(archive_dir, "keystrokes.idx")
+        self.lock_file = os.path.join(archive_dir, "keystrokes.lock")
+        self.segment_pattern = re.compile(r"^keystrokes\.(\d+)\.bin$")
+        self.maps = {}  # Segment number -> mmap, for reading
+
+    def segment_path(self, number):
+        """Path of the segment with the given number."""
+        return os.path.join(self.archive_dir, f"keystrokes.{number:06d}.bin")
+
+    def segments(self):
+        """Numbers of the segments, oldest first."""
+        try:
+            entries = os.listdir(self.archive_dir)
+        except FileNotFoundError:
+            return []
+
+        numbers = []
+        for entry in entries:
+            match = self.segment_pattern.match(entry)
+            if match:
+                numbers.append(int(match.group(1)))
+        return sorted(numbers)
+
+    def append_many(self, sessions):
+        """Append (started, key count, encoded keystrokes) sessions with one fsync per file."""
+        os.makedirs(self.archive_dir, exist_ok=True)
+        with FileLock(self.lock_file):
+            self._append_many(sessions)
+
+    def _append_many(self, sessions):
+        segments = self.segments()
+        number = first = segments[-1] if segments else 0
+        created = not segments or not os.path.exists(self.index_file)
+
+        entries = bytearray()
+        f = open(self.segment_path(number), 'ab')
+        try:
+            for started, keys, data in sessions:
+                if f.tell() >= self.segment_size:
+                    f.flush()
+                    os.fsync(f.fileno())
+                    f.close()
+                    number += 1
+                    f = open(self.segment_path(number), 'ab')
+
+                entries += INDEX_ENTRY.pack(started, number, f.tell(), len(data), keys)
+                f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        finally:
+            f.close()
+
+        with open(self.index_file, 'a+b') as index:
+            # Drop a torn entry left by a crash so the entries stay aligned
+            size = index.seek(0, os.SEEK_END)
+            if size % INDEX_ENTRY.size:
+                index.truncate(size - size % INDEX_ENTRY.size)
+                index.seek(0, os.SEEK_END)
+            index.write(entries)
+            index.flush()
+            os.fsync(index.fileno())
+
+        # New files only survive a crash once their directory entry is flushed
+        if created or number != first:
+            fsync_dir(self.archive_dir)
+
+    def __len__(self):
+        try:
+            return os.path.getsize(self.index_file) // INDEX_ENTRY.size
+        except FileNotFoundError:
+            return 0
+
+    def entries(self, start=0):
+        """Yield a KeylogEntry per archived session, from the ``start``-th on."""
+        try:
+            f = open(self.index_file, 'rb')
+        except FileNotFoundError:
+            return
+
+        with f:
+            count = os.fstat(f.fileno()).st_size // INDEX_ENTRY.size
+            if count <= start:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as index:
+                for position in range(start, count):
+                    yield KeylogEntry._make(INDEX_ENTRY.unpack_from(index, position * INDEX_ENTRY.size))
+
+    def _segment(self, number, end):
+        """Read-only map of a segment covering at least ``end`` bytes."""
+        segment = self.maps.get(number)
+        if segment is None or len(segment) < end:
+            # The last segment grows, map it again once it's past the old map
+            if segment is not None:
+                segment.close()
+            with open(self.segment_path(number), 'rb') as f:
+                segment = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.maps[number] = segment
+        return segment
+
+    def keystrokes(self, entry):
+        """Yield (seconds since the session started, key) for an archived session."""
+        segment = self._segment(entry.segment, entry.offset + entry.length)
+        return decode_keystrokes(segment[entry.offset:entry.offset + entry.length], entry.keys)
+
+    def close(self):
+        """Unmap the segments."""
+        for segment in self.maps.values():
+            segment.close()
+        self.maps.clear()
@@ -0,0 +1,50 @@
+"""
+File lock - advisory locking so several processes can share the history
+"""
+
+import os
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+class FileLock:
+    """Exclusive advisory lock on ``path``, held for a ``with`` block.
+
+    Uses flock() where it exists and msvcrt.locking() on Windows. Waits for
+    other holders, so take it on the background writer, never the UI thread.
+    Each ``with`` opens its own descriptor, so threads exclude each other too.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.fd = None
+
+    def __enter__(self):
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            else:
+                while True:
+                    try:
+                        msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:
+                        continue  # LK_LOCK gives up after 10 seconds, keep waiting
+        except BaseException:
+            os.close(fd)
+            raise
+
+        self.fd = fd
+        return self
+
+    def __exit__(self, *exc_info):
+        fd, self.fd = self.fd, None
+        try:
+            if fcntl is None:
+                msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(fd)  # Closing the descriptor releases a flock()
@@ -0,0 +1,191 @@
+"""
+History store - append-only log of typing results
+"""
+
+import json
+import os
+import re
+
+from .lock import FileLock
+
+SEGMENT_SIZE = 1024 * 1024
+"""Size in bytes after which the active segment is sealed"""
+
+def fsync_dir(path):
+    """Flush a directory entry so renames inside it survive a crash."""
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return  # Directories can't be opened on Windows
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+class HistoryStore:
+    """Append-only JSON Lines log of results, split into segments.
+
+    Results are appended to ``<name>.jsonl`` and fsynced, so a save costs the
+    same no matter how long the history is. Once the active segment grows past
+    ``segment_size`` it is atomically renamed to ``<name>.<number>.jsonl`` and
+    never written again. A crash can at most leave a torn last line, which is
+    skipped when reading.
+
+    Writers hold ``<name>.lock`` while appending, rotating or migrating, so
+    several processes can share the history. Readers don't need it.
+    """
+
+    def __init__(self, history_dir, name="typing_history", segment_size=SEGMENT_SIZE):
+        self.history_dir = history_dir
+        self.name = name
+        self.segment_size = segment_size
+
+        self.active_file = os.path.join(history_dir, f"{name}.jsonl")
+        self.legacy_file = os.path.join(history_dir, f"{name}.json")
+        self.lock_file = os.path.join(history_dir, f"{name}.lock")
+        self.segment_pattern = re.compile(rf"^{re.escape(name)}\.(\d+)\.jsonl$")
+
+    def segment_path(self, number):
+        """Path of the sealed segment with the given number."""
+        return os.path.join(self.history_dir, f"{self.name}.{number:06d}.jsonl")
+
+    def segments(self):
+        """Numbers of the sealed segments, oldest first."""
+        numbers = []
+        for entry in os.listdir(self.history_dir):
+            match = self.segment_pattern.match(entry)
+            if match:
+                numbers.append(int(match.group(1)))
+        return sorted(numbers)
+
+    def migrate(self):
+        """Convert a legacy ``<name>.json`` list into segment 0.
+
+        Segment 0 is reserved for the migration so an interrupted migration
+        simply runs again and overwrites it.
+        """
+        if not os.path.exists(self.legacy_file):
+            return
+
+        with FileLock(self.lock_file):
+            # Another process may have migrated it while we waited
+            if os.path.exists(self.legacy_file):
+                self._migrate()
+
+    def _migrate(self):
+        with open(self.legacy_file, 'r') as f:
+            history = json.load(f)
+
+        temp_file = self.segment_path(0) + ".tmp"
+        with open(temp_file, 'w') as f:
+            for result in history:
+                f.write(json.dumps(result, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+        os.replace(temp_file, self.segment_path(0))
+        os.replace(self.legacy_file, self.legacy_file + ".migrated")
+        fsync_dir(self.history_dir)
+
+    def append(self, record):
+        """Append one record and make it durable."""
+        self.append_many([record])
+
+    def append_many(self, records):
+        """Append records with a single write and fsync."""
+        lines = "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records).encode()
+
+        with FileLock(self.lock_file):
+            with open(self.active_file, 'a+b') as f:
+                # Terminate a torn line left by a crash so it doesn't swallow this one
+                end = f.seek(0, os.SEEK_END)
+                if end:
+                    f.seek(end - 1)
+                    if f.read(1) != b"\n":
+                        lines = b"\n" + lines
+                f.write(lines)
+                f.flush()
+                os.fsync(f.fileno())
+                size = f.tell()
+
+            # Nobody else has the active segment open while we hold the lock
+            if size >= self.segment_size:
+                self._rotate()
+
+    def rotate(self):
+        """Seal the active segment under the next segment number."""
+        with FileLock(self.lock_file):
+            self._rotate()
+
+    def _rotate(self):
+        if not os.path.exists(self.active_file):
+            return
+
+        segments = self.segments()
+        number = segments[-1] + 1 if segments else 1
+        os.replace(self.active_file, self.segment_path(number))
+        fsync_dir(self.history_dir)
+
+    def read_segment(self, path, offset=0):
+        """Stream ``(record, end_offset)`` for the complete lines of a segment."""
+        try:
+            f = open(path, 'rb')
+        except FileNotFoundError:
+            return
+
+        with f:
+            yield from self._read_lines(f, offset)
+
+    def _read_lines(self, f, offset):
+        f.seek(offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                return  # Still being written
+            offset += len(line)
+            try:
+                yield json.loads(line), offset
+            except ValueError:
+                continue  # Torn write from a crash
+
+    def records_since(self, position=(0, 0)):
+        """Stream ``(record, position)`` pairs written after ``position``.
+
+        A position is ``(segment number, byte offset)``. The active segment is
+        numbered as the segment it will be sealed into, so positions stay valid
+        across rotations.
+        """
+        start_segment, start_offset = position
+        segments = self.segments()
+
+        for number in segments:
+            if number < start_segment:
+                continue
+            offset = start_offset if number == start_segment else 0
+            for record, end in self.read_segment(self.segment_path(number), offset):
+                yield record, (number, end)
+
+        active = segments[-1] + 1 if segments else 1
+        if active < start_segment:
+            return
+        try:
+            f = open(self.active_file, 'rb')
+        except FileNotFoundError:
+            return
+
+        with f:
+            # Another writer may have rotated since we listed the segments, then
+            # this file is a newer segment and is read on the next call instead
+            if os.path.exists(self.segment_path(active)):
+                if not os.path.samestat(os.fstat(f.fileno()), os.stat(self.segment_path(active))):
+                    return
+
+            offset = start_offset if active == start_segment else 0
+            for record, end in self._read_lines(f, offset):
+                yield record, (active, end)
+
+    def records(self):
+        """Stream every record, oldest first."""
+        for record, _ in self.records_since():
+            yield record
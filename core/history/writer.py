@@ -0,0 +1,90 @@
+"""
+Background writer - persists results off the UI thread
+"""
+
+from collections import deque
+from itertools import groupby
+from operator import itemgetter
+import atexit
+import threading
+import weakref
+
+_writers = weakref.WeakSet()
+
+MAX_ERRORS = 100
+"""Failures a writer remembers for the report at exit, older ones are dropped"""
+
+class BackgroundWriter:
+    """Runs history writes on a worker thread, batching what piles up.
+
+    ``submit(kind, payload)`` returns immediately. The worker hands each run of
+    consecutive payloads of the same kind to ``handlers[kind]`` as one list,
+    so results saved in quick succession share a single fsync. The worker
+    exits when idle, and every live writer is flushed at interpreter exit.
+
+    Failures are collected in ``errors`` instead of being printed, the most
+    recent MAX_ERRORS of them. They also go to the ``errors`` list submitted
+    with each job in the failed batch, e.g. the round the job belongs to.
+    """
+
+    def __init__(self, handlers):
+        self.handlers = handlers
+        self.errors = deque(maxlen=MAX_ERRORS)
+
+        self.pending = []
+        self.worker = None
+        self.batch_errors = ()  # Error lists of the jobs being written, on the worker
+        self.condition = threading.Condition()
+        _writers.add(self)
+
+    def submit(self, kind, payload, errors=None):
+        """Queue a job, failures writing it are added to ``errors`` when given."""
+        with self.condition:
+            self.pending.append((kind, payload, errors))
+            if self.worker is None:
+                self.worker = threading.Thread(target=self._run, name="shelltype-writer", daemon=True)
+                self.worker.start()
+
+    def flush(self, timeout=None):
+        """Wait until everything submitted so far is written. Returns False on timeout."""
+        with self.condition:
+            return self.condition.wait_for(lambda: self.worker is None, timeout)
+
+    def report(self, message):
+        """Record a failure, against the jobs being written when called from a handler."""
+        self.errors.append(message)
+        if threading.current_thread() is self.worker:
+            for errors in self.batch_errors:
+                errors.append(message)
+
+    def _run(self):
+        while True:
+            with self.condition:
+                if not self.pending:
+                    self.worker = None
+                    self.condition.notify_all()
+                    return
+                batch, self.pending = self.pending, []
+
+            for kind, items in groupby(batch, key=itemgetter(0)):
+                items = list(items)
+                payloads = [payload for _, payload, _ in items]
+                # Each list once, even when several of its jobs are in the batch
+                self.batch_errors = list({id(errors): errors for _, _, errors in items
+                                          if errors is not None}.values())
+                try:
+                    self.handlers[kind](payloads)
+                except Exception as e:
+                    self.report(f"Error saving {kind}: {e}")
+                finally:
+                    self.batch_errors = ()
+
+def flush_all(timeout=None):
+    """Flush every live writer and return the errors they collected."""
+    errors = []
+    for writer in list(_writers):
+        writer.flush(timeout)
+        errors += writer.errors
+    return errors
+
+atexit.register(flush_all)
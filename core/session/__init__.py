@@ -1,5 +1,17 @@
-from .keystroke_recorder import KeystrokeRecorder
-from .run_session import run_typing_session
-from .statistics import TypingStats
-from .typing_session import TypingSession
-from .result_manager import ResultManager
+"""
+Session package - the exports are imported on first use to keep startup fast
+"""
+
+from utils.lazy_exports import lazy_exports
+
+__getattr__ = lazy_exports(__name__, {
+    "LatencyHistogram": ".instrumentation",
+    "SessionInstrumentation": ".instrumentation",
+    "KeystrokeRecorder": ".keystroke_recorder",
+    "run_typing_session": ".run_session",
+    "SessionController": ".run_session",
+    "TypingStats": ".statistics",
+    "SessionTimeline": ".timeline",
+    "TypingSession": ".typing_session",
+    "ResultManager": ".result_manager",
+})
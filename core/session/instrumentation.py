@@ -0,0 +1,93 @@
+"""
+Instrumentation module - key-to-screen latency and frame time histograms
+"""
+
+from array import array
+from bisect import bisect_left
+import time
+
+BUCKET_BOUNDS = [base * 10 ** exponent for exponent in range(-5, 1) for base in (1, 2, 5)]
+"""Upper bucket bounds in seconds, 10 µs to 5 s in a 1-2-5 series"""
+
+class LatencyHistogram:
+    """Fixed-bucket histogram of durations, O(1) memory however many samples."""
+
+    def __init__(self, bounds=BUCKET_BOUNDS):
+        self.bounds = bounds
+        self.counts = array('I', [0]) * (len(bounds) + 1)  # Last bucket is overflow
+        self.count = 0
+        self.max = 0.0
+
+    def record(self, seconds):
+        self.counts[bisect_left(self.bounds, seconds)] += 1
+        self.count += 1
+        if seconds > self.max:
+            self.max = seconds
+
+    def percentile(self, p):
+        """Upper bound in seconds of the bucket holding the p-th percentile."""
+        if not self.count:
+            return 0.0
+
+        rank = p / 100 * self.count
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return min(self.bounds[i], self.max) if i < len(self.bounds) else self.max
+        return self.max
+
+    def summary(self):
+        """Percentiles in milliseconds."""
+        return {
+            "count": self.count,
+            "p50": round(self.percentile(50) * 1000, 3),
+            "p95": round(self.percentile(95) * 1000, 3),
+            "p99": round(self.percentile(99) * 1000, 3),
+            "max": round(self.max * 1000, 3),
+        }
+
+class SessionInstrumentation:
+    """Measures how long keys take to be processed and to reach the screen.
+
+    Call ``key_arrived()`` when getch() returns, ``key_processed()`` after
+    process_key(), ``frame_started()`` before drawing and ``frame_done()``
+    after doupdate(). Every key processed since the previous frame is
+    counted as reaching the screen at ``frame_done()``.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+
+        self.process = LatencyHistogram()
+        """Key arrival to the end of process_key()"""
+        self.key_to_screen = LatencyHistogram()
+        """Key arrival to the refresh that shows it"""
+        self.frame = LatencyHistogram()
+        """Time to draw and refresh one frame"""
+
+        self.pending = array('d')  # Arrival times of keys not on screen yet
+
+    def key_arrived(self):
+        return self.clock()
+
+    def key_processed(self, arrived):
+        self.process.record(self.clock() - arrived)
+        self.pending.append(arrived)
+
+    def frame_started(self):
+        return self.clock()
+
+    def frame_done(self, started):
+        now = self.clock()
+        self.frame.record(now - started)
+        for arrived in self.pending:
+            self.key_to_screen.record(now - arrived)
+        del self.pending[:]
+
+    def summary(self):
+        return {
+            "process": self.process.summary(),
+            "key_to_screen": self.key_to_screen.summary(),
+            "frame": self.frame.summary(),
+        }
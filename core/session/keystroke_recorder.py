@@ -1,20 +1,114 @@
+from array import array
+
+CHUNK_SIZE = 8192
+"""Keystrokes kept in memory before a chunk is spilled to disk"""
+
 class KeystrokeRecorder:
-    """Records keystrokes and session actions (backspace, word completion, etc.)"""
+    """Records keystrokes and session actions (backspace, word completion, etc.)
+
+    Keystrokes are stored column-wise in typed arrays, as monotonic nanosecond
+    timestamps and key codes, which costs 10 bytes per key. With
+    ``spill_to_disk`` full chunks are moved to a temporary file so memory use
+    stays fixed however long the session runs.
+    """
 
-    def __init__(self):
+    def __init__(self, spill_to_disk=False, chunk_size=CHUNK_SIZE):
         self.backspaces = 0
-        self.keystrokes = []
-        self.word_times = []
-        self.key_frequency = {}
-        self.mistakes_by_char = {}
+        self.timestamps = array('q')
+        self.keys = array('H')
+        self.word_times = array('d')
+        self.key_counts = array('I', [0]) * 256
+        self.special_key_counts = {}  # Curses key codes above 255
+
+        # Per expected character: attempts, mistakes and inter-key latency
+        self.char_presses = array('I', [0]) * 256
+        self.char_errors = array('I', [0]) * 256
+        self.char_latency_sum = array('d', [0.0]) * 256
+        self.char_latency_sq = array('d', [0.0]) * 256
+
+        self.spill_to_disk = spill_to_disk
+        self.chunk_size = chunk_size
+        self.spill_file = None
+        self.spilled_chunks = 0
+
+    def __len__(self):
+        return self.spilled_chunks * self.chunk_size + len(self.keys)
 
     def record_keystroke(self, timestamp, key):
-        """Record a keystroke with its timestamp."""
-        self.keystrokes.append((timestamp, key))
+        """Record a keystroke with its timestamp (monotonic seconds)."""
+        self.timestamps.append(int(timestamp * 1_000_000_000))
+        self.keys.append(min(key, 0xFFFF))
 
         # Update key frequency
-        char_key = chr(key) if 32 <= key <= 126 else str(key)
-        self.key_frequency[char_key] = self.key_frequency.get(char_key, 0) + 1
+        if 0 <= key < 256:
+            self.key_counts[key] += 1
+        else:
+            self.special_key_counts[key] = self.special_key_counts.get(key, 0) + 1
+
+        if self.spill_to_disk and len(self.keys) >= self.chunk_size:
+            self._spill()
+
+    def record_char(self, char, correct, latency):
+        """Record an attempt at typing ``char`` and the seconds since the previous key."""
+        code = ord(char)
+        if code >= 256:
+            return
+
+        self.char_presses[code] += 1
+        if not correct:
+            self.char_errors[code] += 1
+        self.char_latency_sum[code] += latency
+        self.char_latency_sq[code] += latency * latency
+
+    def char_stats(self):
+        """Yield (char, presses, errors, latency sum, latency sum of squares)."""
+        for code, presses in enumerate(self.char_presses):
+            if presses:
+                yield (chr(code), presses, self.char_errors[code],
+                       self.char_latency_sum[code], self.char_latency_sq[code])
+
+    @property
+    def mistakes_by_char(self):
+        """Mistake counts keyed by the character that should have been typed."""
+        return {chr(code): errors for code, errors in enumerate(self.char_errors) if errors}
+
+    def _spill(self):
+        """Move the in-memory chunk to the spill file."""
+        if self.spill_file is None:
+            import tempfile  # Only long sessions spill, keep it off the startup path
+            self.spill_file = tempfile.TemporaryFile(prefix="shelltype-keys-")
+
+        self.timestamps.tofile(self.spill_file)
+        self.keys.tofile(self.spill_file)
+        self.spilled_chunks += 1
+
+        del self.timestamps[:]
+        del self.keys[:]
+
+    def iter_keystrokes(self):
+        """Yield every recorded (timestamp_ns, key) pair in order."""
+        if self.spill_file is not None:
+            self.spill_file.flush()
+            self.spill_file.seek(0)
+            for _ in range(self.spilled_chunks):
+                timestamps, keys = array('q'), array('H')
+                timestamps.fromfile(self.spill_file, self.chunk_size)
+                keys.fromfile(self.spill_file, self.chunk_size)
+                yield from zip(timestamps, keys)
+            self.spill_file.seek(0, 2)
+
+        yield from zip(self.timestamps, self.keys)
+
+    @property
+    def key_frequency(self):
+        """Key press counts keyed by character (or key code for non-printables)."""
+        frequency = {}
+        for key, count in enumerate(self.key_counts):
+            if count:
+                frequency[chr(key) if 32 <= key <= 126 else str(key)] = count
+        for key, count in self.special_key_counts.items():
+            frequency[str(key)] = count
+        return frequency
 
     def record_backspace(self):
         """Record use of backspace key."""
@@ -24,4 +118,9 @@ class KeystrokeRecorder:
         """Record time taken to type a word."""
         self.word_times.append(time_taken)
 
-
+    def close(self):
+        """Release the spill file, if any."""
+        if self.spill_file is not None:
+            self.spill_file.close()
+            self.spill_file = None
+            self.spilled_chunks = 0
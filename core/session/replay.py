@@ -0,0 +1,77 @@
+"""
+Replay module - drives a TypingSession without a terminal
+"""
+
+import random
+
+class ManualClock:
+    """Clock for TypingSession that only moves when told to."""
+
+    def __init__(self, now=0.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+def synthetic_keystrokes(typing_session, wpm=80, error_rate=0.03, seed=None):
+    """Yield (seconds since start, key) typing the session's words.
+
+    Keys are evenly spaced for the given WPM, and a fraction of characters is
+    mistyped and then corrected with a backspace.
+    """
+    rng = random.Random(seed)
+    interval = 60 / (wpm * 5)
+    elapsed = 0.0
+    index = 0
+
+    while True:
+        for char in typing_session.words[index]:
+            if rng.random() < error_rate:
+                elapsed += interval
+                yield elapsed, ord(rng.choice("abcdefghijklmnopqrstuvwxyz"))
+                elapsed += interval
+                yield elapsed, 127  # Backspace
+            elapsed += interval
+            yield elapsed, ord(char)
+        elapsed += interval
+        yield elapsed, ord(" ")
+        index += 1
+
+def recorded_keystrokes(keystroke_recorder):
+    """Yield (seconds since the first key, key) from a KeystrokeRecorder."""
+    first = None
+    for timestamp_ns, key in keystroke_recorder.iter_keystrokes():
+        if first is None:
+            first = timestamp_ns
+        yield (timestamp_ns - first) / 1_000_000_000, key
+
+def replay(typing_session, keystrokes, clock, interface=None):
+    """Feed (seconds since start, key) pairs into a started session.
+
+    ``clock`` must be the ManualClock the session was created with. Stops at
+    the time limit or when the session completes, and redraws ``interface``
+    after every key when given. Returns the number of keys fed.
+    """
+    start = typing_session.start_time
+    fed = 0
+
+    for offset, key in keystrokes:
+        if offset >= typing_session.time_limit:
+            clock.now = start + typing_session.time_limit
+            break
+
+        clock.now = start + offset
+        typing_session.process_key(key)
+        typing_session.update_stats()
+        fed += 1
+
+        if interface is not None:
+            interface.draw()
+        if typing_session.completed:
+            break
+
+    typing_session.update_stats()
+    return fed
@@ -1,39 +1,222 @@
+from concurrent.futures import Future
 import os
-import json
+import threading
+import time
+
+# Import custom modules, the query and analytics layers are imported when first used
+from core.history.key_stats import KeyStatsStore
+from core.history.keylog import KeylogArchive, encode_keystrokes
+from core.history.store import HistoryStore
+from core.history.writer import BackgroundWriter
 
 class ResultManager:
-    """Manages saving and loading of typing test results."""
+    """Manages saving and loading of typing test results.
+
+    Saves are queued to a background writer and return immediately; failures
+    end up in ``errors``, and in the ``errors`` list passed with the save. Nothing touches the disk until the history is first
+    written or read.
+    """
 
-    def __init__(self):
+    def __init__(self, history_dir=None):
         self.script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-        self.history_dir = os.path.join(self.script_dir, "session", "history")
-        os.makedirs(self.history_dir, exist_ok=True)
-        self.history_file = os.path.join(self.history_dir, "typing_history.json")
+        self.history_dir = history_dir or os.path.join(self.script_dir, "session", "history")
+        self.prepared = False
+        self.prepare_lock = threading.Lock()
+
+        self.store = HistoryStore(self.history_dir)
+        self.history_file = self.store.active_file
+        self.index_file = os.path.join(self.history_dir, "typing_history.sqlite3")
+        self.key_stats = KeyStatsStore(os.path.join(self.history_dir, "key_stats.json"))
+        self.keylog = KeylogArchive(os.path.join(self.history_dir, "keystrokes"))
+        self._index = None
+        self._writer_index = None  # Only used on the writer thread
+        self._writer_analytics = None
+        self._analytics = None
+
+        # Key stats queued but not merged yet as (sequence, rows), so reads can count
+        # them too, and the totals as of this process's last merge, which never
+        # include pending rows. The lock only guards these, never disk I/O.
+        self.pending_key_stats = []
+        self.key_stats_sequence = 0
+        self.key_totals = None
+        self.key_stats_lock = threading.Lock()
+
+        self.writer = BackgroundWriter({
+            "results": self._write_results,
+            "key stats": self._write_key_stats,
+            "keystrokes": self._write_keystrokes,
+            "rank": self._rank_results,
+        })
+
+    @property
+    def errors(self):
+        """Recent messages for saves and loads that failed, reported at exit."""
+        return self.writer.errors
+
+    def prepare(self):
+        """Create the history directory and migrate legacy history, once."""
+        with self.prepare_lock:
+            if self.prepared:
+                return
+            os.makedirs(self.history_dir, exist_ok=True)
+            try:
+                self.store.migrate()
+            except Exception as e:
+                self.writer.report(f"Error migrating history: {e}")
+            self.prepared = True
+
+    def save_result(self, result, errors=None):
+        """Queue the test result to be appended to the history log."""
+        self.writer.submit("results", result, errors)
+
+    def save_key_stats(self, char_stats, errors=None):
+        """Queue a session's per-character counters to be merged into the lifetime totals."""
+        char_stats = list(char_stats)
+        with self.key_stats_lock:
+            self.key_stats_sequence += 1
+            batch = (self.key_stats_sequence, char_stats)
+            self.pending_key_stats.append(batch)
+            self.writer.submit("key stats", batch, errors)  # In sequence order
+
+    def save_keystrokes(self, keystrokes, start_ns, started=None, errors=None):
+        """Queue a session's raw (timestamp_ns, key) pairs for the keystroke archive.
+
+        They're encoded right away, so the recorder can be closed afterwards.
+        """
+        keys, data = encode_keystrokes(keystrokes, start_ns)
+        self.writer.submit("keystrokes", (started or time.time(), keys, data), errors)
+
+    def percentile_rank(self, wpm, word_source=None, time_limit=None, errors=None):
+        """Future percentage of the mode's results slower than ``wpm``.
+
+        Computed on the writer thread once the saves queued before it are
+        written. It resolves to None without NumPy, or with fewer than two
+        results.
+        """
+        future = Future()
+        self.writer.submit("rank", (future, wpm, word_source, time_limit), errors)
+        return future
+
+    def flush(self, timeout=None):
+        """Wait for queued saves to be written."""
+        return self.writer.flush(timeout)
+
+    def _write_results(self, results):
+        self.prepare()
+        self.store.append_many(results)
+        self._sync_index()
+
+    def _open_writer_index(self):
+        if self._writer_index is None:
+            from core.history.index import HistoryIndex, SYNC_TIMEOUT
+            self._writer_index = HistoryIndex(self.store, self.index_file, SYNC_TIMEOUT,
+                                              check_same_thread=False)
+        return self._writer_index
 
-    def save_result(self, result):
-        """Save the test result to the history file."""
+    def _sync_index(self):
+        """Ingest new results into the query index here, so queries don't have to."""
         try:
-            # Read existing history
-            if os.path.exists(self.history_file):
-                with open(self.history_file, 'r') as f:
-                    history = json.load(f)
-            else:
-                history = []
+            self._open_writer_index().sync()
+        except Exception as e:
+            self.writer.report(f"Error indexing history: {e}")
 
-            # Append new result and save
-            history.append(result)
-            with open(self.history_file, 'w') as f:
-                json.dump(history, f, indent=2)
+    def _rank_results(self, requests):
+        ranks = [None] * len(requests)
+        try:
+            self.prepare()
+            if self._writer_analytics is None:
+                from core.history.analytics import HistoryAnalytics
+                self._writer_analytics = HistoryAnalytics(self._open_writer_index())
+            else:
+                self._writer_analytics.refresh()
 
+            analytics = self._writer_analytics
+            if len(analytics) > 1:
+                ranks = [analytics.percentile_rank(wpm, word_source=word_source, time_limit=time_limit)
+                         for _, wpm, word_source, time_limit in requests]
+        except ImportError:
+            pass  # No numpy, no ranks
         except Exception as e:
-            print(f"Error saving results: {e}")
+            self.writer.report(f"Error ranking results: {e}")
+        finally:
+            for (future, *_), rank in zip(requests, ranks):
+                future.set_result(rank)
+
+    def _write_key_stats(self, batches):
+        totals = None
+        try:
+            self.prepare()
+            self._load_key_totals()
+            totals = self.key_stats.merge(row for _, char_stats in batches for row in char_stats)
+        finally:
+            merged = {sequence for sequence, _ in batches}
+            with self.key_stats_lock:
+                if totals is not None:
+                    self.key_totals = totals
+                # Committed, or failed and dropped, either way no longer pending
+                self.pending_key_stats = [batch for batch in self.pending_key_stats
+                                          if batch[0] not in merged]
+
+    def _load_key_totals(self):
+        """Read the lifetime totals once, before this process first merges into them."""
+        if self.key_totals is not None:
+            return
+        totals = self.key_stats.load()
+        with self.key_stats_lock:
+            # Merges only start once totals are set, so if they still aren't,
+            # the file can't hold any pending rows yet
+            if self.key_totals is None:
+                self.key_totals = totals
+
+    def _write_keystrokes(self, sessions):
+        self.prepare()
+        self.keylog.append_many(sessions)
+
+    def weak_keys(self, **kwargs):
+        """Lifetime weakest keys, including sessions not written yet.
+
+        Never waits for a merge in progress, the totals are the ones this
+        process last merged into, plus its pending sessions.
+        """
+        self._load_key_totals()
+        with self.key_stats_lock:
+            totals = self.key_totals
+            pending = [row for _, char_stats in self.pending_key_stats for row in char_stats]
+        return self.key_stats.weak_keys(pending=pending, totals=totals, **kwargs)
 
     def get_history(self):
-        """Retrieve all historical results."""
-        if os.path.exists(self.history_file):
+        """Stream all historical results, oldest first."""
+        try:
+            self.prepare()
+            yield from self.store.records()
+        except Exception as e:
+            self.writer.report(f"Error loading history: {e}")
+
+    @property
+    def index(self):
+        """Queryable SQLite index over the history, opened on first use.
+
+        Its queries don't wait for other processes, they can raise
+        sqlite3.OperationalError when the database is busy.
+        """
+        if self._index is None:
+            from core.history.index import HistoryIndex
+            self.prepare()
+            self._index = HistoryIndex(self.store, self.index_file)
+        return self._index
+
+    @property
+    def analytics(self):
+        """Up to date HistoryAnalytics, or None when numpy isn't installed.
+
+        Loading it reads the whole index, use percentile_rank() from the UI.
+        """
+        if self._analytics is None:
             try:
-                with open(self.history_file, 'r') as f:
-                    return json.load(f)
-            except Exception as e:
-                print(f"Error loading history: {e}")
-        return []
+                from core.history.analytics import HistoryAnalytics
+                self._analytics = HistoryAnalytics(self.index)
+            except ImportError:
+                return None
+        else:
+            self._analytics.refresh()
+        return self._analytics
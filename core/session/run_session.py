@@ -1,57 +1,182 @@
 from _curses import window
 
 import curses
+import math
 import time
 
 # Import custom modules
-from ui.screens.results.interface import ResultsInterface
+from constants.timing import MAX_FPS
 from ui.screens.session.interface import SessionInterface
 
+from .instrumentation import SessionInstrumentation
+from .result_manager import ResultManager
 from .typing_session import TypingSession
 
-def run_typing_session(stdscr: window, time_limit=60, word_source="common"):
-    """Run the typing session."""
-
-    typing_session = TypingSession(time_limit, word_source)
-    typing_session.start()
-
-    curses.curs_set(0)  # Hide cursor
-
-    while not typing_session.completed:
+ENTER = 10
+"""Key that starts another round from the results screen"""
+
+def next_deadline(typing_session, width):
+    """Return the elapsed time at which the on-screen timers next change.
+
+    The header countdown changes once per second and the progress bar once
+    every ``time_limit / bar_width`` seconds, so nothing needs redrawing
+    between those deadlines unless a key arrives.
+    """
+    elapsed = typing_session.elapsed_time
+    time_limit = typing_session.time_limit
+
+    # Header countdown: int(time_limit - elapsed) drops at each whole second
+    remaining = time_limit - elapsed
+    countdown = time_limit - math.floor(remaining)
+    if countdown <= elapsed:
+        countdown += 1
+
+    # Progress bar: the filled width grows by one cell at each tick
+    bar_width = max(width - 10, 1)
+    tick = time_limit / bar_width
+    progress_tick = (math.floor(elapsed / tick) + 1) * tick
+
+    return min(countdown, progress_tick, time_limit)
+
+class SessionController:
+    """Runs typing rounds back to back on one screen.
+
+    Rounds run in a loop rather than by recursion, and everything that
+    outlives a round (the screen setup, the result manager with its
+    background writer and history index, the cached word lists) is set up
+    once. A round only leaves its result behind, so memory stays flat
+    however many times the user restarts.
+    """
+
+    def __init__(self, stdscr: window, time_limit=60, word_source="common", max_fps=MAX_FPS,
+                 instrument=False, result_manager=None, clock=time.monotonic):
+        self.stdscr = stdscr
+        self.time_limit = time_limit
+        self.word_source = word_source
+        self.frame_interval = 1 / max_fps if max_fps > 0 else 0
+        self.instrument = instrument
+        self.result_manager = result_manager or ResultManager()
+        self.clock = clock
+        self.rounds = 0
+
+    def setup_screen(self):
+        """Prepare the terminal, once for all rounds."""
+        curses.curs_set(0)  # Hide cursor
+
+    def update_screen(self):
+        """Send the staged screen changes to the terminal."""
+        curses.doupdate()
+
+    def run(self):
+        """Play rounds until the user leaves the results screen with anything but Enter."""
+        self.setup_screen()
+
+        while True:
+            typing_session = self.play_round()
+            key = self.show_results(typing_session)
+            typing_session.keystroke_recorder.close()
+            self.rounds += 1
+
+            if key != ENTER:
+                return
+            self.stdscr.clear()
+
+    def new_round(self):
+        """Return the next round's session, not started yet.
+
+        Loading its words can read files, the server calls this off its loop.
+        """
+        typing_session = TypingSession(self.time_limit, self.word_source, clock=self.clock,
+                                       result_manager=self.result_manager)
+        typing_session.instrumentation = SessionInstrumentation() if self.instrument else None
+        return typing_session
+
+    def play_round(self):
+        """Run one typing session to completion, save it and return it.
+
+        With ``instrument``, key-to-screen latency and frame times are
+        measured, shown in a debug overlay and saved with the result.
+        """
+        stdscr = self.stdscr
+        typing_session = self.new_round()
+        typing_session.start()
+
+        steps = self.round_steps(typing_session)
         try:
-            # Draw interface
-            SessionInterface(typing_session, stdscr).draw()
-
-            # Get input
-            key = stdscr.getch()
-            if key != -1:  # -1 means no key pressed
-                typing_session.process_key(key)
-
-            # Update stats
-            typing_session.update_stats()
-
-            # Check time limit
-            if typing_session.elapsed_time >= typing_session.time_limit:
-                typing_session.completed = True
-
-            # Short sleep to reduce CPU usage
-            time.sleep(0.01)
-
+            wait = next(steps)
+            while True:
+                stdscr.timeout(max(0, math.ceil(wait * 1000)))
+                wait = steps.send(stdscr.getch())  # -1 means the timeout expired
+        except StopIteration:
+            pass
         except KeyboardInterrupt:
             typing_session.completed = True
 
-    # Save results
-    typing_session.save_result()
+        # Queued for the background writer, the results show right away
+        typing_session.save_result()
+        return typing_session
+
+    def round_steps(self, typing_session):
+        """Play a started round as a generator, so any input loop can drive it.
+
+        It yields how many seconds to wait for a key, and is sent the key,
+        -1 when none came in time or None when the input closed, which ends
+        the round. A wait of 0 asks for keys that are already queued. The
+        screen is staged with update_screen() before the waits that follow
+        a frame.
+        """
+        stdscr = self.stdscr
+        instrumentation = typing_session.instrumentation
+        interface = SessionInterface(typing_session, stdscr)
+        frame_interval = self.frame_interval
+        last_frame = -math.inf
+        dirty = True
+
+        while not typing_session.completed:
+            # Redraw only when something changed, at most max_fps times a second
+            now = self.clock()
+            if dirty and now - last_frame >= frame_interval:
+                if instrumentation is not None:
+                    frame_started = instrumentation.frame_started()
+                interface.draw()
+                self.update_screen()
+                if instrumentation is not None:
+                    instrumentation.frame_done(frame_started)
+                last_frame = now
+                dirty = False
+
+            # Sleep until a key arrives or the next timer (or frame) is due
+            if dirty:
+                wait = last_frame + frame_interval - now
+            else:
+                wait = next_deadline(typing_session, stdscr.getmaxyx()[1]) - typing_session.elapsed_time
+
+            # Handle the key, then drain anything else already queued
+            key = yield max(0, wait)
+            while key is not None and key != -1:
+                if instrumentation is not None:
+                    arrived = instrumentation.key_arrived()
+                    typing_session.process_key(key)
+                    instrumentation.key_processed(arrived)
+                else:
+                    typing_session.process_key(key)
+                key = yield 0
+            if key is None:
+                return
+
+            # A key arrived or a timer deadline passed, either way redraw
+            typing_session.update_stats()
+            dirty = True
 
-    # Show results
-    results = ResultsInterface(typing_session, stdscr)
-    restart = results.watch_user_input()
-    results.draw()
+    def show_results(self, typing_session):
+        """Show the results of a round and return the key that left the screen."""
+        self.stdscr.timeout(-1)  # Make getch blocking again
 
-    stdscr.nodelay(False)  # Make getch blocking again
+        # The screen is only imported once it's needed
+        from ui.screens.results.interface import ResultsInterface
+        return ResultsInterface(typing_session, self.stdscr).draw()
 
-    if restart == 10:
-        # Restart the session
-        stdscr.clear()
-        stdscr.refresh()
-        run_typing_session(stdscr, time_limit, word_source)
+def run_typing_session(stdscr: window, time_limit=60, word_source="common", max_fps=MAX_FPS,
+                       instrument=False):
+    """Run typing sessions until the user leaves the results screen."""
+    SessionController(stdscr, time_limit, word_source, max_fps, instrument).run()
@@ -1,7 +1,17 @@
+from collections import deque
+
+ROLLING_WINDOW = 10
+"""Seconds of typing covered by the rolling WPM"""
+
 class TypingStats:
-    """Manages typing statistics and calculations."""
+    """Manages typing statistics and calculations.
 
-    def __init__(self):
+    Character counts are updated on every keystroke and the rest as words are
+    completed, so reading a statistic never rescans the session no matter how
+    long it runs.
+    """
+
+    def __init__(self, rolling_window=ROLLING_WINDOW):
         self.accuracy = 100.0
         self.consistency = 0
         self.correct_chars = 0
@@ -10,29 +20,67 @@ class TypingStats:
         """Account only for correct characters"""
         self.wpm_raw = 0
         """Account for both correct and incorrect characters"""
+        self.wpm_rolling = 0
+        """Account only for correct characters typed in the last rolling_window seconds"""
+        self.burst_peak = 0
+        self.burst_min = 0
+        """Fastest and slowest single-word speeds in WPM"""
+
+        # Welford running mean and variance of word times
+        self.word_count = 0
+        self.word_time_mean = 0.0
+        self.word_time_m2 = 0.0
+
+        # Correct characters of the words completed inside the rolling window
+        self.rolling_window = rolling_window
+        self.recent_words = deque()  # (elapsed time, correct chars)
+        self.recent_chars = 0
+
+    def record_char(self, correct):
+        """Count a character as soon as it's typed."""
+        if correct:
+            self.correct_chars += 1
+        else:
+            self.incorrect_chars += 1
 
-    def update_character_stats(self, input_text, target_text):
-        """Update character statistics based on comparison between input and target."""
-        # Count correct and incorrect characters
-        for i, (c1, c2) in enumerate(zip(input_text, target_text)):
-            if c1 == c2:
-                self.correct_chars += 1
-            else:
-                self.incorrect_chars += 1
-
-        # Account for length differences
-        diff = abs(len(input_text) - len(target_text))
-        if len(input_text) < len(target_text):
-            self.incorrect_chars += diff
-
-    def calculate_consistency(self, word_times):
+    def undo_char(self, correct):
+        """Take back a character erased with backspace."""
+        if correct:
+            self.correct_chars -= 1
+        else:
+            self.incorrect_chars -= 1
+
+    def record_missing(self, count):
+        """Count the characters a word was submitted without as incorrect."""
+        self.incorrect_chars += count
+
+    def record_word(self, word_time, correct_chars, elapsed_time):
+        """Fold a completed word into the running statistics."""
+        # Welford update of the word time mean and variance
+        self.word_count += 1
+        delta = word_time - self.word_time_mean
+        self.word_time_mean += delta / self.word_count
+        self.word_time_m2 += delta * (word_time - self.word_time_mean)
+        self.calculate_consistency()
+
+        # Burst speed of this word
+        if word_time > 0:
+            burst = (correct_chars / 5) / (word_time / 60)
+            if self.word_count == 1 or burst > self.burst_peak:
+                self.burst_peak = burst
+            if self.word_count == 1 or burst < self.burst_min:
+                self.burst_min = burst
+
+        self.recent_words.append((elapsed_time, correct_chars))
+        self.recent_chars += correct_chars
+
+    def calculate_consistency(self):
         """Calculate typing consistency score based on word times."""
-        if not word_times or len(word_times) < 2:
+        if self.word_count < 2:
             return 0
 
         # Simple consistency calculation based on variation in word times
-        avg_time = sum(word_times) / len(word_times)
-        variance = sum((t - avg_time) ** 2 for t in word_times) / len(word_times)
+        variance = self.word_time_m2 / self.word_count
 
         # Lower variance means higher consistency
         self.consistency = 100 / (1 + variance)
@@ -53,8 +101,15 @@ class TypingStats:
         self.wpm_raw = word_raw / time_in_minutes # Raw WPM calculation
         self.wpm = word / time_in_minutes # WPM calculation
 
+        # Rolling WPM - drop words that left the window
+        window_start = elapsed_time - self.rolling_window
+        while self.recent_words and self.recent_words[0][0] < window_start:
+            self.recent_chars -= self.recent_words.popleft()[1]
+        window_minutes = min(elapsed_time, self.rolling_window) / 60
+        self.wpm_rolling = (self.recent_chars / 5) / window_minutes
+
         # Accuracy calculation - Percentage of correctly pressed keys
         if total_chars > 0:
-            self.accuracy = (self.correct_chars / word) * 100
+            self.accuracy = (self.correct_chars / total_chars) * 100
         else:
             self.accuracy = 100.0
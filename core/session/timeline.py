@@ -0,0 +1,50 @@
+from array import array
+import math
+
+MAX_SECONDS = 24 * 60 * 60
+"""Longest timeline kept, later keys land in the last bucket"""
+
+class SessionTimeline:
+    """Per-second counts of correct characters, raw characters and errors.
+
+    Buckets live in fixed-size arrays sized for the time limit, so recording
+    a key is O(1) and the WPM-over-time series is available as soon as the
+    session ends, without going back over the keystrokes.
+    """
+
+    def __init__(self, time_limit):
+        buckets = min(max(int(math.ceil(time_limit)), 1), MAX_SECONDS)
+        self.correct = array('I', [0]) * buckets
+        self.raw = array('I', [0]) * buckets
+        self.errors = array('I', [0]) * buckets
+
+    def record(self, elapsed_time, correct):
+        """Count a typed character at ``elapsed_time`` seconds."""
+        second = min(max(int(elapsed_time), 0), len(self.raw) - 1)
+        self.raw[second] += 1
+        if correct:
+            self.correct[second] += 1
+        else:
+            self.errors[second] += 1
+
+    def seconds(self, elapsed_time):
+        """Number of buckets covered after ``elapsed_time`` seconds."""
+        return min(max(int(math.ceil(elapsed_time)), 1), len(self.raw))
+
+    def wpm(self, elapsed_time):
+        """Average WPM at the end of each second so far."""
+        series = []
+        correct = 0
+        for second in range(self.seconds(elapsed_time)):
+            correct += self.correct[second]
+            series.append(correct / 5 * 60 / (second + 1))
+        return series
+
+    def to_dict(self, elapsed_time):
+        """Compact form saved with the result: one int list per counter."""
+        seconds = self.seconds(elapsed_time)
+        return {
+            "correct": self.correct[:seconds].tolist(),
+            "raw": self.raw[:seconds].tolist(),
+            "errors": self.errors[:seconds].tolist(),
+        }
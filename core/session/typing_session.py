@@ -7,38 +7,62 @@ import curses
 import time
 
 # Import custom modules
-from utils.word_list import word_list
+from utils.word_list import ADAPTIVE_SOURCE
+from utils.word_stream import WordStream
 
 from .keystroke_recorder import KeystrokeRecorder
 from .result_manager import ResultManager
 from .statistics import TypingStats
+from .timeline import SessionTimeline
+from .word_tracker import CORRECT, WordTracker
+
+SPILL_TIME_LIMIT = 600
+"""Sessions this long (in seconds) spill recorded keystrokes to disk"""
 
 class TypingSession:
     """Core functionality for the typing session."""
 
-    def __init__(self, time_limit=60, word_source="common"):
+    def __init__(self, time_limit=60, word_source="common", clock=time.monotonic,
+                 result_manager=None):
         # Session metadata
         self.completed = False
         self.time_limit = time_limit
         self.word_source = word_source
-        self.words = word_list(word_source)
+        self.result_manager = result_manager or ResultManager()
+        self.errors = []  # Failures loading words for and saving this round, for its results screen
+        if word_source == "adaptive":
+            self._update_adaptive_profile()
+        self.words = WordStream(word_source, time_limit=time_limit, errors=self.errors)
 
         # Session state
         self.current_word_index = 0
         self.current_input = ""
+        self.tracker = WordTracker(self.words[0])  # Correctness of current_input
         self.start_time = 0
         self.elapsed_time = 0
+        self.clock = clock  # Seconds, monotonic; replaced for headless replay
 
         # Advanced analytics
         self.stats = TypingStats()
-        self.keystroke_recorder = KeystrokeRecorder()
-        self.result_manager = ResultManager()
+        self.timeline = SessionTimeline(time_limit)
+        self.keystroke_recorder = KeystrokeRecorder(spill_to_disk=time_limit >= SPILL_TIME_LIMIT)
         self.word_start_time = 0  # Track when the current word started
+        self.last_key_time = 0  # Track when the previous character was typed
+        self.instrumentation = None  # SessionInstrumentation when measuring latency
+
+    def _update_adaptive_profile(self):
+        """Point the adaptive word source at the lifetime per-key error rates."""
+        from utils.adaptive_words import adaptive_sampler, error_rates
+        sampler = adaptive_sampler(ADAPTIVE_SOURCE)
+        rates = error_rates(self.result_manager.key_stats.load())
+        if rates != sampler.error_rates:  # Usually the same as last round
+            sampler.update_error_rates(rates)
 
     def start(self):
         """Initialize the session and start the timer."""
-        self.start_time = time.time()
+        self.start_time = self.clock()
         self.word_start_time = self.start_time
+        self.last_key_time = self.start_time
         self.completed = False
 
     def process_key(self, key):
@@ -46,8 +70,12 @@ class TypingSession:
         if self.completed:
             return
 
+        # Resizes are handled by the interface, they're not typing
+        if key == curses.KEY_RESIZE:
+            return
+
         # Record the keystroke timing
-        current_time = time.time()
+        current_time = self.clock()
         self.keystroke_recorder.record_keystroke(current_time, key)
 
         # Exit on ESC key
@@ -58,6 +86,7 @@ class TypingSession:
         if key in (curses.KEY_BACKSPACE, 127, 8):  # Backspace keys
             if self.current_input:
                 self.current_input = self.current_input[:-1]
+                self.stats.undo_char(self.tracker.backspace() == CORRECT)
                 self.keystroke_recorder.record_backspace()
             return
 
@@ -68,7 +97,19 @@ class TypingSession:
 
         # Regular character input
         if 32 <= key <= 126:  # Printable ASCII
-            self.current_input += chr(key)
+            char = chr(key)
+            position = len(self.current_input)
+            current_word = self.tracker.word
+            correct = self.tracker.type(char)
+            self.stats.record_char(correct)
+            self.timeline.record(current_time - self.start_time, correct)
+
+            # Attribute the attempt to the expected character, or the typed one past the word end
+            expected = current_word[position] if position < len(current_word) else char
+            self.keystroke_recorder.record_char(expected, correct, current_time - self.last_key_time)
+            self.last_key_time = current_time
+
+            self.current_input += char
 
     def _process_word_completion(self, current_time):
         """Handle word completion when pressing Space key."""
@@ -77,20 +118,20 @@ class TypingSession:
         self.keystroke_recorder.record_word_time(word_time)
         self.word_start_time = current_time
 
-        # Check word accuracy
-        current_word = self.words[self.current_word_index]
-        self.stats.update_character_stats(self.current_input, current_word)
+        # Typed characters are already counted, what's left of the word was missed
+        self.stats.record_missing(self.tracker.missing)
+        self.stats.record_word(word_time, self.tracker.correct, current_time - self.start_time)
 
-        # Move to next word
+        # Move to next word, the stream prefetches more as we get close to its end
         self.current_word_index += 1
-        if self.current_word_index >= len(self.words):
-            self.completed = True
+        self.words.advance(self.current_word_index)
+        self.tracker.reset(self.words[self.current_word_index])
 
         self.current_input = ""
 
     def update_stats(self):
         """Update WPM and accuracy stats."""
-        self.elapsed_time = time.time() - self.start_time
+        self.elapsed_time = self.clock() - self.start_time
 
         if self.elapsed_time >= self.time_limit:
             self.completed = True
@@ -108,7 +149,18 @@ class TypingSession:
             "time_limit": self.time_limit,
             "word_source": self.word_source,
             "elapsed_time": round(self.elapsed_time, 2),
-            "consistency": round(self.stats.calculate_consistency(self.keystroke_recorder.word_times)),
+            "consistency": round(self.stats.calculate_consistency()),
+            "burst_peak": round(self.stats.burst_peak, 2),
+            "burst_min": round(self.stats.burst_min, 2),
         }
 
-        self.result_manager.save_result(result)
+        result["timeline"] = self.timeline.to_dict(self.elapsed_time)
+
+        if self.instrumentation is not None:
+            result["latency"] = self.instrumentation.summary()
+
+        self.result_manager.save_result(result, self.errors)
+        self.result_manager.save_key_stats(self.keystroke_recorder.char_stats(), self.errors)
+        self.result_manager.save_keystrokes(self.keystroke_recorder.iter_keystrokes(),
+                                            int(self.start_time * 1_000_000_000),
+                                            time.time() - self.elapsed_time, self.errors)
@@ -0,0 +1,72 @@
+from array import array
+
+PENDING, CORRECT, INCORRECT = 0, 1, 2
+"""States of a character of the current word"""
+
+class WordTracker:
+    """Correctness of each character typed into the current word.
+
+    Every character and backspace updates the counts and the runs of
+    consecutive characters sharing a state in O(1), so the statistics are
+    live while typing and the current word can be drawn one run at a time.
+    """
+
+    def __init__(self, word=""):
+        self.reset(word)
+
+    def reset(self, word):
+        """Start tracking a new target word."""
+        self.word = word
+        self.states = bytearray()  # State per typed character
+        self.run_states = bytearray()  # State of each run of equal states
+        self.run_lengths = array('I')
+        self.correct = 0
+
+    @property
+    def incorrect(self):
+        """Typed characters that don't match, including ones past the end of the word."""
+        return len(self.states) - self.correct
+
+    @property
+    def missing(self):
+        """Characters of the word not typed yet."""
+        return max(len(self.word) - len(self.states), 0)
+
+    def type(self, char):
+        """Track a typed character and return whether it was correct."""
+        position = len(self.states)
+        correct = position < len(self.word) and self.word[position] == char
+        state = CORRECT if correct else INCORRECT
+
+        self.states.append(state)
+        self.correct += correct
+        if self.run_states and self.run_states[-1] == state:
+            self.run_lengths[-1] += 1
+        else:
+            self.run_states.append(state)
+            self.run_lengths.append(1)
+        return correct
+
+    def backspace(self):
+        """Forget the last typed character, returning its state (PENDING if there was none)."""
+        if not self.states:
+            return PENDING
+
+        state = self.states.pop()
+        self.correct -= state == CORRECT
+        self.run_lengths[-1] -= 1
+        if not self.run_lengths[-1]:
+            self.run_states.pop()
+            self.run_lengths.pop()
+        return state
+
+    def runs(self):
+        """Yield (state, start, end) runs covering the word, the untyped rest as PENDING."""
+        start = 0
+        for state, length in zip(self.run_states, self.run_lengths):
+            end = min(start + length, len(self.word))
+            if end > start:
+                yield state, start, end
+            start += length
+        if start < len(self.word):
+            yield PENDING, start, len(self.word)
@@ -10,19 +10,24 @@ from _curses import window
 import curses
 import argparse
 
-# Import custom modules
-from ui.screens.start import StartInterface
-from core.session.run_session import run_typing_session
+# Import custom modules, screens are imported when first used
+from constants.timing import MAX_FPS
 
 
 def main():
     """Parse command line arguments and start the application."""
+    from utils.word_list import available_sources, warm_up
+
     parser = argparse.ArgumentParser(description='Terminal Typing Test')
     parser.add_argument('-t', '--time', type=int, default=60,
                         help='Time limit in seconds (default: 60)')
     parser.add_argument('-w', '--words', type=str, default="common",
-                        choices=['common', 'programming', 'quotes'],
-                        help='Word list to use (default: common)')
+                        choices=available_sources(),
+                        help='Word list to use, including lists built with utils.corpus_builder (default: common)')
+    parser.add_argument('--fps', type=int, default=MAX_FPS,
+                        help=f'Maximum redraws per second, 0 for no cap (default: {MAX_FPS})')
+    parser.add_argument('--debug-latency', action='store_true',
+                        help='Show input latency and frame times, and save them with the result')
     parser.add_argument('-m', '--menu', action='store_true',
                         help='Show the main menu (default behavior)')
     args = parser.parse_args()
@@ -43,14 +48,24 @@ def main():
         stdscr.clear() # Start with a clear screen
 
         if args.menu:
+            from ui.screens.start import StartInterface
             StartInterface(stdscr).draw()
         else:
-            run_typing_session(stdscr, args.time, args.words)
+            from core.session.run_session import run_typing_session
+            run_typing_session(stdscr, args.time, args.words, args.fps, args.debug_latency)
+
+    # Load the word list while curses starts up
+    warm_up(args.words)
 
     try:
         curses.wrapper(initialize_curses)
     except KeyboardInterrupt:
         print("Shelltyping session finished.")
+    finally:
+        # Results are saved in the background, finish writing them and report failures
+        from core.history.writer import flush_all
+        for error in flush_all():
+            print(error)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,2 @@
+from .telnet import TelnetParser
+from .typing_server import TypingServer
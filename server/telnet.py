@@ -0,0 +1,124 @@
+"""
+Telnet module - just enough of the telnet protocol to drive a session
+"""
+
+IAC = 255
+DONT, DO, WONT, WILL = 254, 253, 252, 251
+SB, SE = 250, 240
+
+ECHO = 1
+SUPPRESS_GO_AHEAD = 3
+NAWS = 31  # Negotiate About Window Size
+
+ESC = 27
+
+NEGOTIATION = bytes([
+    IAC, WILL, ECHO,               # We echo, so the client stops local echo
+    IAC, WILL, SUPPRESS_GO_AHEAD,  # Character at a time instead of lines
+    IAC, DO, SUPPRESS_GO_AHEAD,
+    IAC, DO, NAWS,                 # Ask the client for its window size
+])
+
+# Terminal setup sent after negotiation: alternate screen, hide cursor, clear
+TERMINAL_SETUP = b"\x1b[?1049h\x1b[?25l\x1b[H\x1b[2J"
+TERMINAL_RESET = b"\x1b[?25h\x1b[?1049l"
+
+class TelnetParser:
+    """Turns raw client bytes into curses-style key codes.
+
+    ``feed()`` returns key codes and ``(height, width)`` tuples for window size
+    reports. Telnet commands are stripped, CR/LF become Enter (10), DEL and BS
+    become backspace (127) and escape sequences (arrows etc.) are dropped so
+    only a lone ESC ends a session.
+    """
+
+    def __init__(self):
+        self.pending = b""
+        self.last_cr = False
+
+    def feed(self, data):
+        data = self.pending + data
+        self.pending = b""
+        events = []
+
+        i = 0
+        while i < len(data):
+            byte = data[i]
+
+            if byte == IAC:
+                consumed = self._command(data, i, events)
+                if consumed is None:
+                    self.pending = data[i:]  # Incomplete command, wait for more
+                    break
+                i += consumed
+                continue
+
+            if byte == ESC:
+                consumed = self._escape(data, i)
+                if consumed is None:
+                    self.pending = data[i:]
+                    break
+                if consumed == 1:
+                    events.append(ESC)
+                i += consumed
+                continue
+
+            if byte in (13, 10):
+                # CR LF, CR NUL and bare LF are all a single Enter
+                if not (byte == 10 and self.last_cr):
+                    events.append(10)
+                self.last_cr = byte == 13
+                i += 1
+                continue
+            if byte == 0 and self.last_cr:
+                self.last_cr = False
+                i += 1
+                continue
+
+            self.last_cr = False
+            if byte in (8, 127):
+                events.append(127)
+            elif byte >= 32:
+                events.append(byte)
+            i += 1
+
+        return events
+
+    def _command(self, data, i, events):
+        """Handle the telnet command at data[i], return the bytes it used."""
+        if i + 1 >= len(data):
+            return None
+        command = data[i + 1]
+
+        if command == IAC:
+            events.append(IAC)  # Escaped 0xFF data byte
+            return 2
+        if command in (DO, DONT, WILL, WONT):
+            return 3 if i + 2 < len(data) else None
+        if command == SB:
+            end = data.find(bytes([IAC, SE]), i + 2)
+            if end == -1:
+                return None
+            payload = data[i + 2:end].replace(bytes([IAC, IAC]), bytes([IAC]))
+            if len(payload) == 5 and payload[0] == NAWS:
+                width = payload[1] << 8 | payload[2]
+                height = payload[3] << 8 | payload[4]
+                if width and height:
+                    events.append((height, width))
+            return end + 2 - i
+        return 2
+
+    def _escape(self, data, i):
+        """Length of the escape sequence at data[i], 1 for a lone ESC."""
+        if i + 1 >= len(data):
+            return 1  # ESC at the end of a read is a key press
+        if data[i + 1] not in b"[O":
+            return 1
+
+        # CSI / SS3: parameters then a final byte in 0x40-0x7E
+        j = i + 2
+        while j < len(data):
+            if 0x40 <= data[j] <= 0x7E:
+                return j + 1 - i
+            j += 1
+        return None
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+
+"""
+Typing server - hosts many typing sessions over telnet in one event loop
+
+    python -m server.typing_server --port 2323
+    telnet localhost 2323
+"""
+
+import argparse
+import asyncio
+import curses
+
+# Import custom modules
+from core.session.result_manager import ResultManager
+from constants.timing import MAX_FPS
+from core.session.run_session import ENTER, SessionController
+from ui.headless import AnsiWindow
+from ui.screens.results.interface import ResultsInterface
+from ui.screens.results.stats import RANK_POLL_MS
+from utils.word_list import available_sources
+
+from .telnet import NEGOTIATION, TERMINAL_RESET, TERMINAL_SETUP, TelnetParser
+
+KEY_QUEUE_SIZE = 1024
+"""Keys buffered per connection before we stop reading its socket"""
+
+class Connection:
+    """One client: its parsed key queue and the screen we render for it."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+        self.window = AnsiWindow()
+        self.keys = asyncio.Queue(KEY_QUEUE_SIZE)
+        self.closed = False
+
+    async def read_keys(self):
+        """Parse client input into the key queue until the client goes away."""
+        parser = TelnetParser()
+        try:
+            while True:
+                data = await self.reader.read(4096)
+                if not data:
+                    break
+                for event in parser.feed(data):
+                    if isinstance(event, tuple):
+                        self.window.resize(*event)
+                        event = curses.KEY_RESIZE
+                    # Blocks when the queue is full, which stops reading the
+                    # socket and pushes back on the client
+                    await self.keys.put(event)
+        except ConnectionError:
+            pass
+        finally:
+            self.closed = True
+            await self.keys.put(None)  # Wake the session loop
+
+    async def next_key(self, timeout):
+        """Return the next key, -1 on timeout or None once the client left."""
+        if timeout == 0:
+            return self.keys.get_nowait() if not self.keys.empty() else -1
+        try:
+            return await asyncio.wait_for(self.keys.get(), timeout)
+        except asyncio.TimeoutError:
+            return -1
+
+    async def flush(self):
+        """Send pending screen updates, waiting while the client is behind."""
+        data = self.window.take_output()
+        if data and not self.closed:
+            self.writer.write(data)
+            # Only waits above the transport's high-water mark
+            await self.writer.drain()
+
+class RemoteController(SessionController):
+    """SessionController drawing on a connection's AnsiWindow.
+
+    The server drives its rounds from the event loop with round_steps(),
+    drawing leaves the output in the window until the connection flushes it.
+    """
+
+    def update_screen(self):
+        pass
+
+class TypingServer:
+    """Runs typing sessions for many telnet clients in one asyncio loop.
+
+    All connections share the process-wide word-list cache and a single
+    ResultManager, whose background writer batches the results of sessions
+    ending together and keeps fsyncs off the loop.
+    """
+
+    def __init__(self, host="127.0.0.1", port=2323, time_limit=60, word_source="common",
+                 max_fps=MAX_FPS, result_manager=None):
+        self.host = host
+        self.port = port
+        self.time_limit = time_limit
+        self.word_source = word_source
+        self.max_fps = max_fps
+
+        self.result_manager = result_manager or ResultManager()
+        self.connections = set()
+        self.server = None
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        return self.server
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        if self.server is not None:
+            self.server.close()
+            await self.server.wait_closed()
+        await asyncio.get_running_loop().run_in_executor(None, self.result_manager.flush)
+
+    async def handle_connection(self, reader, writer):
+        connection = Connection(reader, writer)
+        self.connections.add(connection)
+        reader_task = asyncio.create_task(connection.read_keys())
+        controller = RemoteController(connection.window, self.time_limit, self.word_source,
+                                      self.max_fps, result_manager=self.result_manager)
+        loop = asyncio.get_running_loop()
+
+        try:
+            writer.write(NEGOTIATION + TERMINAL_SETUP)
+            await writer.drain()
+
+            while not connection.closed:
+                typing_session = await self.run_session(connection, controller)
+                if connection.closed:
+                    typing_session.keystroke_recorder.close()
+                    break
+
+                # Encoding the keystrokes and queueing the saves stay off the loop
+                await loop.run_in_executor(None, typing_session.save_result)
+
+                key = await self.show_results(connection, typing_session)
+                typing_session.keystroke_recorder.close()
+                if key != ENTER:
+                    break
+        except (ConnectionError, curses.error):
+            pass  # Client left, or its window is too small to draw in
+        finally:
+            self.connections.discard(connection)
+            reader_task.cancel()
+            try:
+                writer.write(TERMINAL_RESET)
+                writer.close()
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+            # The client's results are on disk once its handler returns
+            await loop.run_in_executor(None, self.result_manager.flush)
+
+    async def run_session(self, connection, controller):
+        """Run one typing session on a connection with the controller's round_steps()."""
+        # Its words and the adaptive profile may be read from disk
+        typing_session = await asyncio.get_running_loop().run_in_executor(None, controller.new_round)
+        typing_session.start()
+        connection.window.clear()
+
+        steps = controller.round_steps(typing_session)
+        try:
+            wait = next(steps)
+            while True:
+                await connection.flush()
+                wait = steps.send(await connection.next_key(wait))
+        except StopIteration:
+            pass  # Time's up, or the client disconnected
+        return typing_session
+
+    async def show_results(self, connection, typing_session):
+        """Show the results with ResultsInterface and return the key that left the screen.
+
+        The interface is built off the loop, it reads the lifetime key stats.
+        The rank is computed on the writer thread, the loop only checks
+        whether it's ready.
+        """
+        window = connection.window
+        results = await asyncio.get_running_loop().run_in_executor(
+            None, ResultsInterface, typing_session, window)
+        window.clear()
+        results.draw_results()
+        while True:
+            await connection.flush()
+            key = await connection.next_key(None if results.ranked else RANK_POLL_MS / 1000)
+            if key is None:
+                return key
+            key = results.handle_key(key)
+            if key is not None:
+                return key
+
+def main():
+    parser = argparse.ArgumentParser(description='Multi-user terminal typing test server')
+    parser.add_argument('--host', type=str, default="127.0.0.1",
+                        help='Address to listen on (default: 127.0.0.1)')
+    parser.add_argument('-p', '--port', type=int, default=2323,
+                        help='Port to listen on (default: 2323)')
+    parser.add_argument('-t', '--time', type=int, default=60,
+                        help='Time limit in seconds (default: 60)')
+    parser.add_argument('-w', '--words', type=str, default="common",
+                        choices=available_sources(),
+                        help='Word list to use, including lists built with utils.corpus_builder (default: common)')
+    parser.add_argument('--fps', type=int, default=MAX_FPS,
+                        help=f'Maximum redraws per second per client (default: {MAX_FPS})')
+    args = parser.parse_args()
+
+    server = TypingServer(args.host, args.port, args.time, args.words, args.fps)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("Shelltyping server stopped.")
+
+if __name__ == "__main__":
+    main()
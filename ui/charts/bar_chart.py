@@ -1,11 +1,18 @@
 """Bar chart"""
 
-import curses
+# Partial blocks for eighths of a cell
+BAR_EIGHTHS = " ▏▎▍▌▋▊▉"
 
 def draw_bar_chart(stdscr, y, x, width, values, max_value, title=""):
+    """Draw one horizontal bar per (label, value), one addstr per row.
+
+    Bars use eighth-cell blocks, so short bars still differ visibly.
+    """
     if not values:
         return
 
+    max_y, max_x = stdscr.getmaxyx()
+
     # Draw title
     if title:
         stdscr.addstr(y, x, title)
@@ -16,18 +23,14 @@ def draw_bar_chart(stdscr, y, x, width, values, max_value, title=""):
 
     # Draw each bar
     for i, (label, value) in enumerate(values):
-        if y + i >= curses.LINES - 1:
+        if y + i >= max_y - 1:
             break
 
-        # Draw label
-        stdscr.addstr(y + i, x, f"{label[:15]:<15}")
+        # Bar length in eighths of a cell
+        eighths = int((value / max_value) * bar_width * 8) if max_value > 0 else 0
+        bar = "█" * (eighths // 8) + (BAR_EIGHTHS[eighths % 8] if eighths % 8 else "")
 
-        # Draw bar
-        bar_length = int((value / max_value) * bar_width) if max_value > 0 else 0
-        bar = "█" * bar_length
-        stdscr.addstr(y + i, x + 15, bar)
-
-        # Draw value
+        # Label, bar and value in a single call
         value_str = f" {value:.1f}" if isinstance(value, float) else f" {value}"
-        stdscr.addstr(y + i, x + 15 + bar_length + 1, value_str)
-
+        row = f"{label[:15]:<15}{bar}{value_str}"
+        stdscr.addstr(y + i, x, row[:max(max_x - x - 1, 0)])
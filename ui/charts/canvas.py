@@ -0,0 +1,60 @@
+"""Braille canvas - 2x4 sub-cell resolution plotting in text"""
+
+BRAILLE_BASE = 0x2800
+
+# Dot bit for (column, row) inside a braille cell
+BRAILLE_DOTS = (
+    (0x01, 0x02, 0x04, 0x40),
+    (0x08, 0x10, 0x20, 0x80),
+)
+
+class BrailleCanvas:
+    """In-memory cell buffer where every cell holds 2x4 braille dots.
+
+    Plot with ``set()`` and ``line()`` in dot coordinates, then read back one
+    string per row with ``rows()`` to draw each with a single addstr.
+    """
+
+    def __init__(self, width, height):
+        self.width = width    # In cells
+        self.height = height
+        self.cells = [bytearray(width) for _ in range(height)]
+
+    @property
+    def dot_width(self):
+        return self.width * 2
+
+    @property
+    def dot_height(self):
+        return self.height * 4
+
+    def set(self, x, y):
+        """Turn on the dot at (x, y), (0, 0) being the top left."""
+        if 0 <= x < self.dot_width and 0 <= y < self.dot_height:
+            self.cells[y // 4][x // 2] |= BRAILLE_DOTS[x % 2][y % 4]
+
+    def line(self, x0, y0, x1, y1):
+        """Draw a line between two dots (Bresenham)."""
+        dx, dy = abs(x1 - x0), -abs(y1 - y0)
+        sx = 1 if x0 < x1 else -1
+        sy = 1 if y0 < y1 else -1
+        error = dx + dy
+
+        while True:
+            self.set(x0, y0)
+            if x0 == x1 and y0 == y1:
+                return
+            double = 2 * error
+            if double >= dy:
+                error += dy
+                x0 += sx
+            if double <= dx:
+                error += dx
+                y0 += sy
+
+    def rows(self):
+        """One string per cell row, empty cells as spaces."""
+        return [
+            "".join(chr(BRAILLE_BASE + bits) if bits else " " for bits in row)
+            for row in self.cells
+        ]
@@ -0,0 +1,40 @@
+"""Downsampling for charts"""
+
+def lttb(values, threshold):
+    """Largest-Triangle-Three-Buckets downsampling.
+
+    Reduces ``values`` to ``threshold`` points while keeping its visual shape
+    (peaks and dips survive, unlike plain averaging or striding). Returns a
+    list of ``(index, value)`` pairs, always including the first and last.
+    """
+    n = len(values)
+    if threshold >= n or threshold < 3:
+        return list(enumerate(values))
+
+    sampled = [(0, values[0])]
+    bucket_size = (n - 2) / (threshold - 2)
+    a = 0  # Index of the previously selected point
+
+    for i in range(threshold - 2):
+        # Average of the next bucket, the third corner of the triangle
+        next_start = int((i + 1) * bucket_size) + 1
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        next_count = next_end - next_start
+        avg_x = (next_start + next_end - 1) / 2
+        avg_y = sum(values[next_start:next_end]) / next_count
+
+        # Pick the point of this bucket forming the largest triangle
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+        a_y = values[a]
+        best, best_area = start, -1.0
+        for j in range(start, end):
+            area = abs((a - avg_x) * (values[j] - a_y) - (a - j) * (avg_y - a_y))
+            if area > best_area:
+                best, best_area = j, area
+
+        sampled.append((best, values[best]))
+        a = best
+
+    sampled.append((n - 1, values[n - 1]))
+    return sampled
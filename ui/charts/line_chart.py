@@ -2,20 +2,28 @@
 
 from _curses import window
 
-import curses
+from .canvas import BrailleCanvas
+from .downsample import lttb
 
 def draw_line_chart(stdscr: window, y, x, width, height, values, title=""):
+    """Plot values as a braille line, one addstr per screen row.
+
+    Long series are downsampled with LTTB to the horizontal dot resolution
+    first, so the cost depends on the chart size and not on len(values).
+    """
     if not values or width <= 20:
         return
 
+    max_y, max_x = stdscr.getmaxyx()
+
     # Draw title
     if title:
         stdscr.addstr(y, x, title)
         y += 1
 
-    # Calculate dimensions
-    plot_width = width - 10
-    plot_height = height - 2
+    # Calculate dimensions, clipped to the window
+    plot_width = min(width - 10, max_x - x - 1)
+    plot_height = min(height - 2, max_y - y - 1)
 
     if plot_width <= 0 or plot_height <= 0 or len(values) <= 1:
         return
@@ -25,39 +33,27 @@ def draw_line_chart(stdscr: window, y, x, width, height, values, title=""):
     max_val = max(values)
     value_range = max_val - min_val if max_val > min_val else 1
 
-    # Draw axes
-    for i in range(plot_height):
-        stdscr.addstr(y + i, x, "|")
-
-    for i in range(plot_width):
-        stdscr.addstr(y + plot_height, x + i + 1, "-")
+    # Rasterize the downsampled series
+    canvas = BrailleCanvas(plot_width, plot_height)
+    points = lttb(values, canvas.dot_width)
+    x_scale = (canvas.dot_width - 1) / (len(values) - 1)
+    y_scale = (canvas.dot_height - 1) / value_range
+
+    previous = None
+    for index, value in points:
+        dot = (round(index * x_scale), round((max_val - value) * y_scale))
+        if previous is not None:
+            canvas.line(*previous, *dot)
+        else:
+            canvas.set(*dot)
+        previous = dot
+
+    # Draw axes and plot, one row at a time
+    for i, row in enumerate(canvas.rows()):
+        stdscr.addstr(y + i, x, "|" + row)
+    stdscr.addstr(y + plot_height, x + 1, "-" * plot_width)
 
     # Draw scale
-    stdscr.addstr(y, x - 4, f"{max_val:.0f}")
-    stdscr.addstr(y + plot_height - 1, x - 4, f"{min_val:.0f}")
-
-    # Draw line chart
-    if len(values) > 1:
-        x_step = plot_width / (len(values) - 1)
-        prev_x, prev_y = None, None
-
-        for i, value in enumerate(values):
-            chart_x = int(x + 1 + i * x_step)
-            chart_y = int(y + plot_height - 1 - ((value - min_val) / value_range * (plot_height - 1)))
-
-            if 0 <= chart_y < curses.LINES and 0 <= chart_x < curses.COLS:
-                stdscr.addstr(chart_y, chart_x, "●")
-
-                # Draw connecting line
-                if prev_x is not None and prev_y is not None:
-                    # Simple line drawing
-                    if prev_y == chart_y:
-                        for x_pos in range(prev_x + 1, chart_x):
-                            if x_pos < curses.COLS:
-                                stdscr.addstr(chart_y, x_pos, "-")
-                    elif prev_x == chart_x:
-                        for y_pos in range(min(prev_y, chart_y) + 1, max(prev_y, chart_y)):
-                            if y_pos < curses.LINES:
-                                stdscr.addstr(y_pos, chart_x, "|")
-
-                prev_x, prev_y = chart_x, chart_y
+    if x >= 4:
+        stdscr.addstr(y, x - 4, f"{max_val:.0f}")
+        stdscr.addstr(y + plot_height - 1, x - 4, f"{min_val:.0f}")
@@ -0,0 +1,128 @@
+"""
+Headless module - fake curses windows for running the UI without a terminal
+"""
+
+import curses
+
+class FakeWindow:
+    """In-memory stand-in for a curses window.
+
+    Implements the parts of the window API the screens use. Text goes into a
+    virtual screen, and ``noutrefresh()``/``refresh()`` diff it against the
+    last refreshed screen the way curses does, counting the bytes a terminal
+    would have been sent in ``bytes_written``.
+    """
+
+    def __init__(self, height=24, width=80, keys=()):
+        self.height = height
+        self.width = width
+        self.keys = list(keys)
+
+        self.screen = [[" "] * width for _ in range(height)]
+        self.physical = None  # Last refreshed screen, None forces a full repaint
+        self.touched = set()  # Rows written since the last refresh
+        self.bytes_written = 0
+        self.addstr_calls = 0
+        self.refreshes = 0
+        self.cursor = (0, 0)
+
+    def getmaxyx(self):
+        return self.height, self.width
+
+    def resize(self, height, width):
+        """Simulate a terminal resize."""
+        self.height, self.width = height, width
+        self.screen = [[" "] * width for _ in range(height)]
+        self.physical = None
+        self.touched = set(range(height))
+
+    def addstr(self, y, x, text, attr=0):
+        if not 0 <= y < self.height or not 0 <= x < self.width:
+            raise curses.error("addwstr() returned ERR")
+
+        self.addstr_calls += 1
+        self.touched.add(y)
+        row = self.screen[y]
+        for i, char in enumerate(text[:self.width - x]):
+            row[x + i] = char
+        self.cursor = (y, min(x + len(text), self.width - 1))
+
+    def move(self, y, x):
+        self.cursor = (y, x)
+
+    def clrtoeol(self):
+        y, x = self.cursor
+        self.touched.add(y)
+        self.screen[y][x:] = [" "] * (self.width - x)
+
+    def erase(self):
+        for row in self.screen:
+            row[:] = [" "] * self.width
+        self.touched = set(range(self.height))
+
+    def clear(self):
+        self.erase()
+        self.physical = None
+
+    def noutrefresh(self):
+        """Count the terminal bytes needed to bring the screen up to date."""
+        self.refreshes += 1
+
+        if self.physical is None:
+            self.write("\x1b[H\x1b[2J")
+            self.physical = [[" "] * self.width for _ in range(self.height)]
+
+        for y in sorted(self.touched):
+            row, shown = self.screen[y], self.physical[y]
+            x = 0
+            while x < self.width:
+                if row[x] == shown[x]:
+                    x += 1
+                    continue
+                # A run of changed cells costs a cursor move plus its text
+                start = x
+                while x < self.width and row[x] != shown[x]:
+                    x += 1
+                self.write(f"\x1b[{y + 1};{start + 1}H" + "".join(row[start:x]))
+                shown[start:x] = row[start:x]
+        self.touched.clear()
+
+    def refresh(self):
+        self.noutrefresh()
+
+    def write(self, text):
+        """Send text to the (imaginary) terminal."""
+        self.bytes_written += len(text.encode())
+
+    def getch(self):
+        return self.keys.pop(0) if self.keys else -1
+
+    def timeout(self, delay):
+        pass
+
+    def nodelay(self, flag):
+        pass
+
+    def keypad(self, flag):
+        pass
+
+    def row(self, y):
+        """Text currently on row ``y`` of the virtual screen."""
+        return "".join(self.screen[y])
+
+class AnsiWindow(FakeWindow):
+    """FakeWindow that keeps the ANSI output, e.g. to send it over a socket."""
+
+    def __init__(self, height=24, width=80):
+        super().__init__(height, width)
+        self.output = []
+
+    def write(self, text):
+        super().write(text)
+        self.output.append(text)
+
+    def take_output(self):
+        """Return and forget the bytes produced since the last call."""
+        data = "".join(self.output).encode()
+        self.output.clear()
+        return data
@@ -1,3 +1,11 @@
-from .results.interface import ResultsInterface
-from .session.interface import SessionInterface
-from .start.interface import StartInterface
+"""
+Screens package - each screen is imported when first used to keep startup fast
+"""
+
+from utils.lazy_exports import lazy_exports
+
+__getattr__ = lazy_exports(__name__, {
+    "ResultsInterface": ".results.interface",
+    "SessionInterface": ".session.interface",
+    "StartInterface": ".start.interface",
+})
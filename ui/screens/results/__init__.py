@@ -1,4 +1,6 @@
+from .chart import ResultChart
 from .header import ResultsHeader
 from .interface import ResultsInterface
 from .instructions import ResultInstructions
 from .stats import ResultStats
+from .weak_keys import ResultWeakKeys
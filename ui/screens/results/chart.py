@@ -0,0 +1,24 @@
+from _curses import window
+
+# Import custom modules
+from ui.charts.line_chart import draw_line_chart
+
+from .layout import ResultsLayout
+
+class ResultChart:
+    """WPM over time chart for the results screen."""
+    def __init__(self, typing_session, stdscr: window):
+        self.stdscr = stdscr
+        self.wpm = typing_session.timeline.wpm(typing_session.elapsed_time)
+
+    def draw(self):
+        # At the top of the panel next to the stats, when there's room for it
+        layout = ResultsLayout(self.stdscr)
+        chart = layout.chart()
+        if chart is None or len(self.wpm) < 2:
+            return
+
+        # The scale is drawn in the four columns left of the plot
+        top, chart_height = chart
+        draw_line_chart(self.stdscr, top, layout.panel_x + 4, layout.panel_width - 4,
+                        chart_height, self.wpm, "WPM over time")
@@ -5,9 +5,9 @@ class ResultsHeader:
     def __init__(self, typing_session, stdscr: window):
         self.stdscr = stdscr
         self.typing_session = typing_session
-        self.width = stdscr.getmaxyx()[1]
 
         self.title = "SHELLTYPING SESSION RESULTS"
 
     def draw(self):
-        self.stdscr.addstr(5, (self.width - len(self.title)) // 2, self.title) # Title
+        width = self.stdscr.getmaxyx()[1]  # Redrawn after a resize
+        self.stdscr.addstr(5, (width - len(self.title)) // 2, self.title) # Title
@@ -4,33 +4,70 @@ Results module - handles display of basic typing test results
 
 from _curses import window
 
+import curses
+
 # Import custom modules
+from .chart import ResultChart
 from .header import ResultsHeader
 from .instructions import ResultInstructions
-from .stats import ResultStats
+from .stats import RANK_POLL_MS, ResultStats, request_rank
+from .weak_keys import ResultWeakKeys
 
 class ResultsInterface:
-    """Shows the basic results screen."""
+    """Shows the basic results screen.
+
+    The parts that don't change are built once, the lifetime weakest keys
+    read the key stats file, so the server builds the interface off its loop.
+    """
 
     def __init__(self, typing_session, stdscr: window):
         self.stdscr = stdscr
         self.typing_session = typing_session
+        # Ranked against the history in the background, the rest shows right away
+        self.rank = request_rank(typing_session)
+        self.ranked = False
+
+        self.header = ResultsHeader(typing_session, stdscr)
+        self.chart = ResultChart(typing_session, stdscr)
+        self.weak_keys = ResultWeakKeys(typing_session, stdscr)
+        self.instructions = ResultInstructions(stdscr)
 
     def draw(self):
+        """Show the results, then wait for the key that leaves the screen and return it."""
         self.stdscr.clear()
+        self.draw_results()
+        return self.watch_user_input()
 
-        ResultsHeader(self.typing_session, self.stdscr).draw()
-        ResultStats(self.typing_session, self.stdscr).draw()
-        ResultInstructions(self.stdscr).draw()
-
+    def draw_results(self):
+        self.ranked = self.rank.done()
+        self.header.draw()
+        self.chart.draw()
+        # Rebuilt for the rank, and errors reported while it was computed
+        ResultStats(self.typing_session, self.stdscr, self.rank).draw()
+        self.weak_keys.draw()
+        self.instructions.draw()
         self.stdscr.refresh()
-        self.watch_user_input()
+
+    def handle_key(self, key):
+        """Redraw when the rank is ready or the screen was resized.
+
+        ``key`` is -1 when none came before the rank poll. Returns the key
+        when it leaves the screen, None otherwise.
+        """
+        if key == curses.KEY_RESIZE or (not self.ranked and self.rank.done()):
+            self.stdscr.erase()
+            self.draw_results()
+        if key == 27:
+            return key  # Exit on ESC (27)
+        elif key == 10: # Enter key
+            return key
+        return None
 
     def watch_user_input(self):
-        """Wait for user input to exit or continue."""
+        """Wait for user input to exit or continue, adding the rank once it's ready."""
         while True:
-            key = self.stdscr.getch()
-            if key == 27:
-                return key  # Exit on ESC (27)
-            elif key == 10: # Enter key
+            # Blocking again once ranked, like the session left it
+            self.stdscr.timeout(-1 if self.ranked else RANK_POLL_MS)
+            key = self.handle_key(self.stdscr.getch())
+            if key is not None:
                 return key
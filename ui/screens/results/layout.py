@@ -0,0 +1,75 @@
+"""
+Results layout - where the parts of the results screen go for the terminal size
+"""
+
+from _curses import window
+
+PANEL_TOP = 7
+"""First row below the title"""
+
+PANEL_WIDTH = (32, 50)
+"""Narrowest and widest the chart panel gets, a third of the screen in between"""
+
+STATS_MIN_WIDTH = 44
+"""Columns the stats keep to the left of the panel"""
+
+CHART_HEIGHT = (5, 12)
+"""Rows of the WPM chart including its title and axis, three plot rows at least"""
+
+WEAK_KEYS_ROWS = 9
+"""Rows of the weakest keys chart: its title and eight keys"""
+
+STATS_ROWS = 14
+"""Rows of the stats, the rank line included"""
+
+class ResultsLayout:
+    """Column the stats are centered in, and the panel the charts go in.
+
+    The stats stay around the middle rows. When the terminal is wide enough
+    the charts get a panel to their right, from below the title to above
+    the instructions: the WPM chart on top and the weakest keys below it,
+    so both fit on an 80x24 terminal. Otherwise the stats take the whole
+    width and the charts are left out.
+    """
+
+    def __init__(self, stdscr: window):
+        height, width = stdscr.getmaxyx()
+
+        panel_width = min(max(width // 3, PANEL_WIDTH[0]), PANEL_WIDTH[1])
+        if width - panel_width - 2 >= STATS_MIN_WIDTH:
+            self.panel_x = width - panel_width - 1
+            self.panel_width = panel_width
+            self.stats_width = self.panel_x - 1
+        else:
+            self.panel_x = None
+            self.panel_width = 0
+            self.stats_width = width
+
+        self.panel_top = PANEL_TOP
+        self.panel_bottom = height - 3  # The instructions are on height - 2
+        self.error_row = height - 3  # Kept free for a failure of this round
+
+        # Around the middle, moved up so the rank line stays above the error row
+        self.stats_top = max(min(height // 2 - 4, self.error_row - STATS_ROWS), PANEL_TOP)
+
+    def stats_x(self, text):
+        """Column that centers ``text`` in the stats column."""
+        return max(0, (self.stats_width - len(text)) // 2)
+
+    def chart(self):
+        """(y, height) of the WPM chart, or None when it doesn't fit."""
+        available = self.panel_bottom - self.panel_top
+        if self.panel_x is None or available < CHART_HEIGHT[0]:
+            return None
+        # Leave room for the weakest keys below, as long as there are three plot rows
+        height = min(max(available - WEAK_KEYS_ROWS - 1, CHART_HEIGHT[0]), CHART_HEIGHT[1])
+        return self.panel_top, height
+
+    def weak_keys(self):
+        """(y, rows) of the weakest keys chart, below the WPM chart, or None when it doesn't fit."""
+        if self.panel_x is None:
+            return None
+        chart = self.chart()
+        y = chart[0] + chart[1] + 1 if chart is not None else self.panel_top
+        rows = min(self.panel_bottom - y, WEAK_KEYS_ROWS)
+        return (y, rows) if rows >= 2 else None
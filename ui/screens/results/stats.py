@@ -1,8 +1,23 @@
 from _curses import window
 
+from .layout import ResultsLayout
+
+RANK_POLL_MS = 100
+"""How often a results screen checks whether the rank has been computed"""
+
+def request_rank(typing_session):
+    """Ask the background writer for the session's rank among past results."""
+    return typing_session.result_manager.percentile_rank(typing_session.stats.wpm,
+                                                         word_source=typing_session.word_source,
+                                                         time_limit=typing_session.time_limit,
+                                                         errors=typing_session.errors)
+
 class ResultStats:
-    """Displays the statistics of the results."""
-    def __init__(self, typing_session, stdscr: window):
+    """Displays the statistics of the results.
+
+    ``rank`` is the future from request_rank(), its line shows once it's done.
+    """
+    def __init__(self, typing_session, stdscr: window, rank=None):
         self.stdscr = stdscr
         self.typing_session = typing_session
 
@@ -14,6 +29,7 @@ class ResultStats:
             f"WPM: {int(typing_session.stats.wpm)}",
             f"Accuracy: {round(typing_session.stats.accuracy, 1)}%",
             f"Consistency: {round(typing_session.stats.consistency, 1)}%",
+            f"Burst: {int(typing_session.stats.burst_min)}-{int(typing_session.stats.burst_peak)} WPM",
             "",
             f"Correct characters: {typing_session.stats.correct_chars}",
             f"Incorrect characters: {typing_session.stats.incorrect_chars}",
@@ -22,11 +38,25 @@ class ResultStats:
             f"Words completed: {typing_session.current_word_index}",
         ]
 
+        if rank is not None and rank.done() and rank.result() is not None:
+            self.results += [
+                "",
+                f"Faster than {int(rank.result())}% of your {typing_session.time_limit}s {typing_session.word_source} tests",
+            ]
+
+        # This round's last failure in the background, on a row of its own
+        self.error = typing_session.errors[-1] if typing_session.errors else None
+
     def draw(self):
         height, width = self.stdscr.getmaxyx()
+        layout = ResultsLayout(self.stdscr)
 
-        Y_OFFSET = 4
         for i, result in enumerate(self.results):
-            y_pos = (height // 2) - Y_OFFSET + i
-            if y_pos < height - 1:  # Make sure we don't print outside the screen
-                self.stdscr.addstr(y_pos, (width - len(result)) // 2, result)
+            y_pos = layout.stats_top + i
+            if y_pos < layout.error_row:  # Make sure we don't print over the error or outside the screen
+                result = result[:layout.stats_width - 1]  # Keep clear of the charts
+                self.stdscr.addstr(y_pos, layout.stats_x(result), result)
+
+        if self.error and 0 <= layout.error_row < height - 1:
+            error = self.error[:width - 1]
+            self.stdscr.addstr(layout.error_row, (width - len(error)) // 2, error)
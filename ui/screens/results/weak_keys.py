@@ -0,0 +1,26 @@
+from _curses import window
+
+# Import custom modules
+from ui.charts.bar_chart import draw_bar_chart
+
+from .layout import ResultsLayout
+
+class ResultWeakKeys:
+    """Lifetime error rate of the weakest keys, next to the stats."""
+    def __init__(self, typing_session, stdscr: window):
+        self.stdscr = stdscr
+        self.weak_keys = [(f"'{char}'", rate) for char, rate in
+                          typing_session.result_manager.weak_keys()]
+
+    def draw(self):
+        # In the panel next to the stats, below the WPM chart
+        layout = ResultsLayout(self.stdscr)
+        area = layout.weak_keys()
+        if not self.weak_keys or area is None:
+            return
+
+        y, rows = area
+        weak_keys = self.weak_keys[:rows - 1]  # One row goes to the title
+        # The bars leave room for values up to 100.0
+        draw_bar_chart(self.stdscr, y, layout.panel_x, layout.panel_width - 2, weak_keys,
+                       max(rate for _, rate in weak_keys), "Weakest keys (error %)")
@@ -1,7 +1,10 @@
+from .component import SessionComponent
+from .debug_overlay import SessionDebugOverlay
 from .header import SessionHeader
 from .input import SessionInput
 from .instructions import SessionInstructions
 from .interface import SessionInterface
 from .progress_bar import SessionProgressBar
 from .word_current import SessionCurrentWord
+from .word_layout import WordLayout
 from .words import SessionWords
@@ -0,0 +1,97 @@
+from _curses import window
+
+def text_width(text):
+    """Columns taken by a row's text, a string or (text, attr) runs."""
+    return len(text) if isinstance(text, str) else sum(len(run) for run, _ in text)
+
+def clip(x, text, width):
+    """Move a row onto the screen and cut it to fit, leaving the last column free.
+
+    Returns the clipped ``(x, text)``, ``text`` being the same kind as given.
+    """
+    x = max(0, x)
+    room = max(width - 1 - x, 0)
+    if isinstance(text, str):
+        return x, text[:room]
+
+    runs = []
+    for run, attr in text:
+        if room <= 0:
+            break
+        runs.append((run[:room], attr))
+        room -= len(run)
+    return x, tuple(runs)
+
+class SessionComponent:
+    """Retained-mode base for the typing session components.
+
+    Subclasses implement ``layout()`` and return the ``(y, x, text)`` rows to
+    show for the current session state. ``text`` is a string, or a tuple of
+    ``(text, attr)`` runs drawn with one addstr each. The component remembers
+    what it last painted and only repaints the rows that changed since then.
+    Rows are clipped to the window, so a small terminal cuts them short
+    instead of making curses raise.
+    """
+
+    static = False
+    """Static components are laid out once and only repainted after invalidate()"""
+
+    def __init__(self, typing_session, window: window):
+        self.typing_session = typing_session
+        self.window = window
+        self.painted = None  # y -> (x, text) as last painted, None when invalidated
+
+    def layout(self):
+        """Return the (y, x, text) rows for the current state."""
+        raise NotImplementedError
+
+    def invalidate(self):
+        """Forget what was painted, e.g. after the screen was cleared."""
+        self.painted = None
+
+    def resize(self):
+        """Called after the terminal was resized and the screen cleared."""
+        self.invalidate()
+
+    def damaged_rows(self):
+        """Return the rows that need repainting as {y: (old, new)}."""
+        if self.static and self.painted is not None:
+            return {}
+
+        previous = self.painted or {}
+        current = {y: (x, text) for y, x, text in self.layout()}
+
+        damaged = {}
+        for y in previous.keys() | current.keys():
+            if previous.get(y) != current.get(y):
+                damaged[y] = (previous.get(y), current.get(y))
+
+        self.painted = current
+        return damaged
+
+    def draw(self):
+        """Repaint the rows that changed and return how many were repainted."""
+        damaged = self.damaged_rows()
+        height, width = self.window.getmaxyx()
+
+        for y, (old, new) in damaged.items():
+            if not 0 <= y < height:
+                continue
+            if old is not None:
+                # Blank out the old text, curses only sends the cells that differ
+                old_x, old_text = clip(*old, width)
+                if old_text:
+                    self.window.addstr(y, old_x, " " * text_width(old_text))
+            if new is not None:
+                x, text = clip(*new, width)
+                if not text:
+                    continue
+                if isinstance(text, str):
+                    self.window.addstr(y, x, text)
+                else:
+                    for run, attr in text:
+                        if run:
+                            self.window.addstr(y, x, run, attr)
+                        x += len(run)
+
+        return len(damaged)
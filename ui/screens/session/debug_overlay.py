@@ -0,0 +1,21 @@
+from .component import SessionComponent
+
+class SessionDebugOverlay(SessionComponent):
+    """Shows input latency and frame time percentiles while instrumenting."""
+
+    def layout(self):
+        instrumentation = self.typing_session.instrumentation
+        if instrumentation is None:
+            return []
+
+        height, width = self.window.getmaxyx()
+
+        rows = []
+        for i, (name, histogram) in enumerate([
+            ("key->screen", instrumentation.key_to_screen),
+            ("frame", instrumentation.frame),
+        ]):
+            summary = histogram.summary()
+            line = f"{name}: p50 {summary['p50']}ms p95 {summary['p95']}ms p99 {summary['p99']}ms"
+            rows.append((height - 5 + i, max(0, (width - len(line)) // 2), line[:width - 1]))
+        return rows
@@ -1,22 +1,22 @@
-from _curses import window
+from .component import SessionComponent
 
-class SessionHeader:
+class SessionHeader(SessionComponent):
     """Header component for the typing session interface."""
 
-    def __init__(self, typing_session, stdscr: window):
-        self.typing_session = typing_session
-        self.stdscr = stdscr
-        self.width = stdscr.getmaxyx()[1]
+    def layout(self):
+        """Lays out the header for the typing session."""
+        height, width = self.window.getmaxyx()
 
-        self.header = [
-                  f"Shelltyping Session ({typing_session.time_limit}s)",
-                  f"Time: {int(self.typing_session.time_limit - self.typing_session.elapsed_time)}s | WPM: {int(self.typing_session.stats.wpm)} | Accuracy: {int(self.typing_session.stats.accuracy)}%"
-                ]
+        stats = self.typing_session.stats
 
-    def draw(self):
-        """Draws the header for the typing session."""
+        header = [
+            f"Shelltyping Session ({self.typing_session.time_limit}s)",
+            f"Time: {int(self.typing_session.time_limit - self.typing_session.elapsed_time)}s | WPM: {int(stats.wpm)} (last {stats.rolling_window}s: {int(stats.wpm_rolling)}) | Accuracy: {int(stats.accuracy)}% | Consistency: {int(stats.consistency)}%"
+        ]
 
-        for i, line in enumerate(self.header):
+        rows = []
+        for i, line in enumerate(header):
             y_pos = i + 1
-            if y_pos < self.width - 1:
-                self.stdscr.addstr(y_pos, (self.width - len(line)) // 2, line)
+            if y_pos < height - 1:
+                rows.append((y_pos, max(0, (width - len(line)) // 2), line[:width - 1]))
+        return rows
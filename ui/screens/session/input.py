@@ -1,13 +1,10 @@
-from _curses import window
+from .component import SessionComponent
 
-class SessionInput:
+class SessionInput(SessionComponent):
     """Draws the input section for the typing session."""
 
-    def __init__(self, typing_session, stdscr: window):
-        self.stdscr = stdscr
-        self.width = stdscr.getmaxyx()[1]
+    def layout(self):
+        width = self.window.getmaxyx()[1]
+        input_display = f"> {self.typing_session.current_input}"
 
-        self.input_display = f"> {typing_session.current_input}"
-
-    def draw(self):
-        self.stdscr.addstr(9, (self.width - len(self.input_display)) // 2, self.input_display)
+        return [(9, (width - len(input_display)) // 2, input_display)]
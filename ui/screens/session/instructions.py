@@ -1,14 +1,13 @@
-from _curses import window
+from .component import SessionComponent
 
-class SessionInstructions:
+class SessionInstructions(SessionComponent):
     """Draws the instructions for the typing session."""
 
-    def __init__(self, window: window):
-        self.window = window
-        self.height, self.width = window.getmaxyx()
+    static = True
 
-    def draw(self):
-        """Draws the instructions for the typing session."""
+    def layout(self):
+        """Lays out the instructions for the typing session."""
+        height, width = self.window.getmaxyx()
 
         instructions = "Press ESC to exit | BACKSPACE to delete | SPACE to submit word"
-        self.window.addstr(self.height - 2, (self.width - len(instructions)) // 2, instructions)
+        return [(height - 2, (width - len(instructions)) // 2, instructions)]
@@ -5,6 +5,7 @@ Interface module - handles the UI for the typing test itself
 from _curses import window
 
 # Import custom modules
+from  ui.screens.session.debug_overlay import SessionDebugOverlay
 from  ui.screens.session.header import SessionHeader
 from  ui.screens.session.input import SessionInput
 from  ui.screens.session.instructions import SessionInstructions
@@ -13,21 +14,50 @@ from  ui.screens.session.word_current import SessionCurrentWord
 from  ui.screens.session.words import SessionWords
 
 class SessionInterface:
-    """Draws the typing session interface."""
+    """Draws the typing session interface.
+
+    Components are kept across frames and only repaint the rows that changed.
+    The screen is cleared only on the first frame and after a resize, which
+    is also the only time the words are wrapped again.
+    """
 
     def __init__(self, typing_session, stdscr: window ):
         self.typing_session = typing_session
         self.stdscr = stdscr
+        self.size = None
 
-    def draw(self):
+        self.components = [
+            SessionHeader(typing_session, stdscr),
+            SessionProgressBar(typing_session, stdscr),
+            SessionWords(typing_session, stdscr),
+            SessionInput(typing_session, stdscr),
+            SessionCurrentWord(typing_session, stdscr),
+            SessionInstructions(typing_session, stdscr),
+            SessionDebugOverlay(typing_session, stdscr),
+        ]
+
+    def invalidate(self):
+        """Force a full repaint on the next draw."""
+        self.size = None
+
+    def resize(self):
+        """Clear the screen and lay the components out for its current size."""
+        self.size = self.stdscr.getmaxyx()
         self.stdscr.clear()
+        for component in self.components:
+            component.resize()
+
+    def draw(self):
+        """Repaint the damaged rows and stage them for the next doupdate().
+
+        Returns the number of rows repainted.
+        """
+        # The size only changes on KEY_RESIZE (or before the first frame)
+        if self.stdscr.getmaxyx() != self.size:
+            self.resize()
 
         # Draw each interface component
-        SessionHeader(self.typing_session, self.stdscr).draw()
-        SessionProgressBar(self.typing_session, self.stdscr).draw()
-        SessionWords(self.typing_session, self.stdscr).draw()
-        SessionInput(self.typing_session, self.stdscr).draw()
-        SessionCurrentWord(self.typing_session, self.stdscr).draw()
-        SessionInstructions(self.stdscr).draw()
-
-        self.stdscr.refresh()
+        damaged = sum(component.draw() for component in self.components)
+
+        self.stdscr.noutrefresh()
+        return damaged
@@ -1,31 +1,41 @@
-from _curses import window
+# Import custom modules
+from constants import colors
+from core.session.word_tracker import CORRECT, INCORRECT, PENDING
 
-class SessionCurrentWord:
-    """Current word display - shows the word being typed in the current session"""
+from .component import SessionComponent
 
-    def __init__(self, typing_session, stdscr: window):
-        self.stdscr = stdscr
-        self.width = stdscr.getmaxyx()[1]
+class SessionCurrentWord(SessionComponent):
+    """Current word display - shows the word being typed in the current session
 
-        self.colored_word = ""
+    Typed characters are green when correct and red when not, and the next
+    one is highlighted. Characters sharing a color are drawn as one run.
+    """
 
-        if typing_session.current_word_index < len(typing_session.words):
-            current_word = typing_session.words[typing_session.current_word_index]
+    def layout(self):
+        width = self.window.getmaxyx()[1]
+        tracker = self.typing_session.tracker
+        word = tracker.word
 
-            # Get the current input
-            for i, char in enumerate(current_word):
-                if i < len(typing_session.current_input):
-                    if typing_session.current_input[i] == char:
-                        # Green for correct characters
-                        self.colored_word += char
-                    else:
-                        # Red for incorrect characters
-                        self.colored_word += char
-                else:
-                    self.colored_word += char
+        # Looked up per frame, the color pairs only exist once curses is set up
+        attrs = {CORRECT: colors.CORRECT_CHARACTER, INCORRECT: colors.INCORRECT_CHARACTER}
 
-            if len(self.colored_word) > self.width - 2:
-                self.colored_word = self.colored_word[:self.width - 5] + "..."
+        # Leave room for an ellipsis when the word doesn't fit
+        limit = len(word) if len(word) <= width - 2 else max(width - 5, 0)
 
-    def draw(self):
-        self.stdscr.addstr(11, (self.width - len(self.colored_word)) // 2, self.colored_word)
+        runs = []
+        for state, start, end in tracker.runs():
+            end = min(end, limit)
+            if start >= end:
+                break
+            if state == PENDING:
+                runs.append((word[start], colors.CURRENT_CHARACTER))
+                start += 1
+                if start < end:
+                    runs.append((word[start:end], 0))
+            else:
+                runs.append((word[start:end], attrs[state]))
+        if limit < len(word):
+            runs.append(("...", 0))
+
+        length = sum(len(run) for run, _ in runs)
+        return [(11, (width - length) // 2, tuple(runs))]
@@ -0,0 +1,79 @@
+"""
+Word layout module - wraps the session's word stream into lines
+"""
+
+from array import array
+
+WORD_GAP = 2
+"""Columns between two words, room for the brackets around the current word"""
+
+class WordLayout:
+    """Wraps an endless word stream into lines at most ``width`` columns wide.
+
+    Words are laid out once, as the cursor gets close to them, and the
+    (line, column) of every word is kept in an index, so finding the cursor
+    costs O(1) per frame. Line numbers are absolute and keep growing, lines
+    that scrolled out of view are dropped with ``trim()``. A new terminal
+    width needs a new layout.
+    """
+
+    def __init__(self, words, width, start=0):
+        self.words = words
+        self.width = max(width, 1)
+
+        self.first_word = start  # Absolute index of the first word in the index
+        self.first_line = 0  # Absolute number of lines[0]
+        self.line_of = array('I')  # Word -> line, from first_word on
+        self.column_of = array('H')  # Word -> column, from first_word on
+        self.lines = []  # (first word index, [words]) per line
+        self.column = 0  # Next free column on the last line
+
+    def __len__(self):
+        """Number of lines laid out so far, including dropped ones."""
+        return self.first_line + len(self.lines)
+
+    def _lay_out_next(self):
+        """Place the next word of the stream."""
+        index = self.first_word + len(self.line_of)
+        word = self.words[index]
+
+        # Wrap when the word doesn't fit, unless it's alone on its line anyway
+        if not self.lines or (self.column > 0 and self.column + len(word) > self.width):
+            self.lines.append((index, []))
+            self.column = 0
+
+        self.lines[-1][1].append(word)
+        self.line_of.append(len(self) - 1)
+        self.column_of.append(self.column)
+        self.column += len(word) + WORD_GAP
+
+    def position(self, index):
+        """Return the (line, column) of the word at absolute ``index``."""
+        while index >= self.first_word + len(self.line_of):
+            self._lay_out_next()
+        index -= self.first_word
+        return self.line_of[index], self.column_of[index]
+
+    def line(self, number):
+        """Return (first word index, words) of line ``number``, laying it out as needed."""
+        # A line is complete once the next one has started
+        while len(self) <= number + 1:
+            self._lay_out_next()
+        return self.lines[number - self.first_line]
+
+    def line_start(self, number):
+        """Absolute index of the first word on line ``number``."""
+        return self.line(number)[0]
+
+    def trim(self, number):
+        """Drop the lines before line ``number`` and their words from the index."""
+        drop = number - self.first_line
+        if drop <= 0:
+            return
+
+        first_word = self.lines[drop][0] if drop < len(self.lines) else self.first_word + len(self.line_of)
+        del self.line_of[:first_word - self.first_word]
+        del self.column_of[:first_word - self.first_word]
+        del self.lines[:drop]
+        self.first_word = first_word
+        self.first_line = number
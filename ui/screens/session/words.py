@@ -1,26 +1,52 @@
-from _curses import window
+from .component import SessionComponent
+from .word_layout import WordLayout
 
+TOP = 5
+"""Row of the first line of words"""
 
-class SessionWords:
-    """Draws the words to be typed in the current typing session."""
+VISIBLE_LINES = 3
+"""Lines of words shown, the current line is the second once there's one behind it"""
 
-    def __init__(self, typing_session, window: window):
-        self.window = window
-        self.width = self.window.getmaxyx()[1]
+MAX_LINE_WIDTH = 70
+"""Lines are wrapped at this width, or a bit less than the screen on small terminals"""
 
-        self.words_display = ""
-        max_display_words = 10
-        start_word_idx = max(0, typing_session.current_word_index - 2)
-        display_words = typing_session.words[start_word_idx:
-                                             start_word_idx + max_display_words]
+class SessionWords(SessionComponent):
+    """Draws the words to be typed as a scrolling block of lines."""
 
-        for i, word in enumerate(display_words):
-            absolute_idx = start_word_idx + i
-            if absolute_idx == typing_session.current_word_index:
-                self.words_display += f" [{word}] "
-            else:
-                self.words_display += f" {word} "
+    def __init__(self, typing_session, window):
+        super().__init__(typing_session, window)
+        self.word_layout = None
 
-    def draw(self):
-        self.window.addstr(6, (self.width - len(self.words_display)
-                               ) // 2, self.words_display[:self.width-1])
+    def resize(self):
+        """Wrap the words again for the new width, starting from the line before the cursor."""
+        super().resize()
+        words = self.typing_session.words
+
+        start = 0
+        if self.word_layout is not None:
+            line = self.word_layout.position(self.typing_session.current_word_index)[0]
+            start = self.word_layout.line_start(max(line - 1, self.word_layout.first_line))
+        start = max(start, words.offset)  # Words far behind may be gone from the stream
+
+        width = self.window.getmaxyx()[1]
+        self.word_layout = WordLayout(words, min(width - 4, MAX_LINE_WIDTH), start)
+
+    def layout(self):
+        if self.word_layout is None:
+            self.resize()
+        word_layout = self.word_layout
+        width = self.window.getmaxyx()[1]
+
+        current = self.typing_session.current_word_index
+        top = max(word_layout.position(current)[0] - 1, word_layout.first_line)
+        word_layout.trim(top)
+
+        # Every word takes its columns plus the gap around it, where the current word gets brackets
+        x = max((width - word_layout.width) // 2 - 1, 0)
+        rows = []
+        for i in range(VISIBLE_LINES):
+            first, line = word_layout.line(top + i)
+            text = "".join(f"[{word}]" if first + j == current else f" {word} "
+                           for j, word in enumerate(line))
+            rows.append((TOP + i, x, text[:width - x - 1]))
+        return rows
@@ -0,0 +1,158 @@
+"""
+Adaptive word source - weighted sampling towards the user's weak characters
+"""
+
+from array import array
+import random
+import threading
+
+from utils.word_list import load_corpus
+
+BOOST = 10.0
+"""How much a word's weight grows per unit of error rate of its characters"""
+
+class AliasTable:
+    """Walker/Vose alias table: O(n) to build, O(1) per weighted draw."""
+
+    def __init__(self, weights):
+        n = len(weights)
+        self.probability = array('d', [1.0]) * n
+        self.alias = array('I', range(n))
+
+        total = sum(weights)
+        if not n or total <= 0:
+            return
+
+        scaled = [w * n / total for w in weights]
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+
+        while small and large:
+            less, more = small.pop(), large.pop()
+            self.probability[less] = scaled[less]
+            self.alias[less] = more
+            scaled[more] += scaled[less] - 1.0
+            (small if scaled[more] < 1.0 else large).append(more)
+
+        # Leftovers are 1 up to rounding error
+        for i in small + large:
+            self.probability[i] = 1.0
+
+    def __len__(self):
+        return len(self.probability)
+
+    def draw(self, rng=random):
+        i = int(rng.random() * len(self.probability))
+        return i if rng.random() < self.probability[i] else self.alias[i]
+
+class AdaptiveSampler:
+    """Draws words from a corpus weighted by the user's per-character error rates.
+
+    A word weighs ``1 + BOOST * sum of the error rates of its distinct
+    characters``. An inverted index from character to words means a change in
+    the error profile only touches the words containing the changed
+    characters. Indexing, re-scoring and rebuilding the alias table all
+    happen in a background thread; draws use the last finished table, and
+    are uniform until the first one is ready.
+    """
+
+    def __init__(self, corpus):
+        self.corpus = corpus
+        self.error_rates = {}
+        self.scores = None
+        self.words_by_char = None
+        self.table = None
+
+        self.lock = threading.Lock()
+        self.pending_rates = None
+        self.worker = None
+        self._start_worker()
+
+    def update_error_rates(self, error_rates):
+        """Set the {char: error rate (0-1)} profile, applied in the background."""
+        with self.lock:
+            self.pending_rates = dict(error_rates)
+        self._start_worker()
+
+    def sample(self, k, rng=random):
+        """Draw ``k`` words (with replacement) in O(k)."""
+        table = self.table
+        if table is None or not len(table):
+            return self.corpus.sample(k)
+        return [self.corpus[table.draw(rng)] for _ in range(k)]
+
+    def wait(self):
+        """Block until pending updates are applied (for tools and benchmarks)."""
+        worker = self.worker
+        while worker is not None:
+            worker.join()
+            worker = self.worker
+
+    def _start_worker(self):
+        with self.lock:
+            if self.worker is not None:
+                return  # The running worker picks up pending rates
+            self.worker = threading.Thread(target=self._work, daemon=True)
+            self.worker.start()
+
+    def _work(self):
+        if self.scores is None:
+            self._index()
+
+        while True:
+            with self.lock:
+                rates, self.pending_rates = self.pending_rates, None
+                if rates is None:
+                    self.worker = None
+                    return
+            if self._rescore(rates):
+                self.table = AliasTable(self.scores)
+
+    def _index(self):
+        """Build the character -> words index with everything at weight 1."""
+        words_by_char = {}
+        for i in range(len(self.corpus)):
+            for char in set(self.corpus[i]):
+                words_by_char.setdefault(char, array('I')).append(i)
+
+        self.words_by_char = words_by_char
+        self.scores = array('d', [1.0]) * len(self.corpus)
+        self.table = AliasTable(self.scores)
+
+    def _rescore(self, rates):
+        """Adjust only the words containing characters whose rate changed.
+
+        Returns whether any score changed, i.e. the alias table is stale.
+        """
+        scores = self.scores
+        changed = False
+        for char in rates.keys() | self.error_rates.keys():
+            delta = rates.get(char, 0.0) - self.error_rates.get(char, 0.0)
+            if delta:
+                for i in self.words_by_char.get(char, ()):
+                    scores[i] += BOOST * delta
+                    changed = True
+        self.error_rates = rates
+        return changed
+
+_samplers = {}
+"""Process-wide samplers keyed by the corpus they draw from"""
+
+def adaptive_sampler(word_source="common"):
+    """Return the shared sampler for a corpus, rebuilt if the corpus changed."""
+    corpus = load_corpus(word_source)
+    sampler = _samplers.get(word_source)
+    if sampler is None or sampler.corpus is not corpus:
+        sampler = AdaptiveSampler(corpus)
+        if word_source in _samplers:
+            sampler.update_error_rates(_samplers[word_source].error_rates)
+        _samplers[word_source] = sampler
+    return sampler
+
+def error_rates(key_stats):
+    """Turn KeyStatsStore totals into a {char: error rate} profile."""
+    return {
+        char: errors / presses
+        for char, (presses, errors, _, _) in key_stats.items()
+        if presses
+    }
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+
+"""
+Corpus builder - ranked word lists and quotes from large plain-text sources
+
+Books, source trees, logs: anything readable as text. The sources are cut
+into line-aligned chunks that a process pool tokenizes and counts (map),
+and the per-chunk counts are merged as they arrive (reduce):
+
+    python -m utils.corpus_builder --name books ~/books/*.txt
+    python main.py -w books
+    python main.py -w books-quotes
+"""
+
+import argparse
+from collections import Counter
+from multiprocessing import Pool
+import os
+import random
+import re
+import sys
+import time
+
+# Import custom modules
+from utils.word_list import WORD_LIST_DIR, SOURCE_NAME
+
+CHUNK_SIZE = 16 * 1024 * 1024
+"""Bytes of a source handed to a worker at a time"""
+
+LETTERS = b"abcdefghijklmnopqrstuvwxyz"
+
+TOKENIZE = bytes(
+    byte if byte in LETTERS + b"'" else 32
+    for byte in bytes(range(256)).translate(bytes.maketrans(LETTERS.upper(), LETTERS))
+)
+"""bytes.translate() table: lowercase letters, keep apostrophes, everything else is a space"""
+
+WORD = re.compile(rb"[a-z]+(?:'[a-z]+)*")
+"""A normalized word, contractions kept whole"""
+
+PARAGRAPH_BREAK = re.compile(rb"\n[ \t\r\f\v]*\n")
+
+CONTROL = re.compile(rb"[\x00-\x08\x0b\x0c\x0e-\x1f\x7f]")
+
+NOT_A_WORD = re.compile(rb"(?:^|\s)[^A-Za-z\s]")
+"""Start of a token that isn't a word, e.g. a number or code"""
+
+QUOTE_WORDS = (8, 60)
+"""Word count range of a paragraph kept as a quote"""
+
+QUOTES_PER_CHUNK = 200
+"""Quote candidates a worker sends back per chunk, sampled at random"""
+
+def is_text(path):
+    """Whether a file looks like text, i.e. has no NUL byte in its first 8 KiB."""
+    try:
+        with open(path, 'rb') as f:
+            return b"\0" not in f.read(8192)
+    except OSError:
+        return False
+
+def source_files(sources):
+    """Yield the text files among ``sources``, walking directories."""
+    for source in sources:
+        if os.path.isdir(source):
+            for root, dirs, files in os.walk(source):
+                dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+                for name in sorted(files):
+                    path = os.path.join(root, name)
+                    if is_text(path):
+                        yield path
+        elif is_text(source):
+            yield source
+
+def chunks(paths, chunk_size=CHUNK_SIZE):
+    """Yield (path, start, end) byte ranges covering the files."""
+    for path in paths:
+        size = os.path.getsize(path)
+        for start in range(0, size, chunk_size):
+            yield path, start, min(start + chunk_size, size)
+
+def read_chunk(path, start, end):
+    """Read the lines that start inside [start, end) of a file."""
+    with open(path, 'rb') as f:
+        if start:
+            # The line running into start belongs to the previous chunk
+            f.seek(start - 1)
+            f.readline()
+        if f.tell() >= end:
+            return b""
+
+        data = f.read(end - f.tell())
+        if not data.endswith(b"\n"):
+            data += f.readline()  # Finish the line running past end
+    return data
+
+def is_quote(paragraph):
+    """Whether a paragraph reads as typeable prose of a suitable length."""
+    if not paragraph.isascii() or CONTROL.search(paragraph):
+        return False
+    words = len(paragraph.split())
+    if not QUOTE_WORDS[0] <= words <= QUOTE_WORDS[1]:
+        return False
+    # Mostly words rather than code or log fields
+    return len(NOT_A_WORD.findall(paragraph)) <= 0.1 * words
+
+def count_words(data):
+    """Count the normalized words of a chunk."""
+    # Splitting a translated copy runs in C, only the distinct tokens are cleaned up in Python
+    tokens = Counter(data.translate(TOKENIZE).split())
+
+    counts = Counter()
+    for token, count in tokens.items():
+        word = token.strip(b"'")
+        if word and (word == token or WORD.fullmatch(word)) and b"''" not in word:
+            counts[word] += count
+    return counts
+
+def map_chunk(task):
+    """Count the words of one chunk and sample its quote candidates."""
+    path, start, end, quotes, seed = task
+    data = read_chunk(path, start, end)
+
+    counts = count_words(data)
+
+    candidates = []
+    if quotes:
+        # Check paragraphs in random order until enough are found, not all of them
+        paragraphs = PARAGRAPH_BREAK.split(data)
+        random.Random(seed).shuffle(paragraphs)
+        for paragraph in paragraphs:
+            if is_quote(paragraph):
+                candidates.append(b" ".join(paragraph.split()).decode())
+                if len(candidates) >= QUOTES_PER_CHUNK:
+                    break
+
+    return counts, candidates, end - start
+
+def build(sources, processes=None, quotes=True, chunk_size=CHUNK_SIZE, progress=None):
+    """Count the words of ``sources`` across a process pool.
+
+    Returns (Counter of words as bytes, quote candidates, bytes read).
+    """
+    tasks = [(path, start, end, quotes, seed)
+             for seed, (path, start, end) in enumerate(chunks(source_files(sources), chunk_size))]
+
+    totals = Counter()
+    candidates = []
+    done = 0
+    with Pool(processes) as pool:
+        # Merge each chunk's counts as soon as it's done, in whatever order
+        for counts, chunk_quotes, size in pool.imap_unordered(map_chunk, tasks):
+            totals.update(counts)
+            candidates += chunk_quotes
+            done += size
+            if progress is not None:
+                progress(done)
+
+    return totals, candidates, done
+
+def rank(counts, top, min_count=2, min_length=1, max_length=15):
+    """The ``top`` most frequent words within the length limits, most frequent first."""
+    words = [(count, word) for word, count in counts.items()
+             if count >= min_count and min_length <= len(word) <= max_length]
+    words.sort(key=lambda entry: (-entry[0], entry[1]))
+    return [word.decode() for _, word in words[:top]]
+
+def write_atomic(path, text):
+    """Replace ``path`` with ``text`` without anyone seeing a half-written file."""
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    with open(temp_path, 'w') as f:
+        f.write(text)
+    os.replace(temp_path, path)
+
+def main():
+    parser = argparse.ArgumentParser(description='Build word lists and quotes from text sources')
+    parser.add_argument('sources', nargs='+',
+                        help='Text files or directories to read')
+    parser.add_argument('-n', '--name', type=str, required=True,
+                        help='Word source name, writes <name>.txt and <name>-quotes.txt')
+    parser.add_argument('--top', type=int, default=5000,
+                        help='Words kept, most frequent first (default: 5000)')
+    parser.add_argument('--min-count', type=int, default=2,
+                        help='Ignore words seen fewer times (default: 2)')
+    parser.add_argument('--min-length', type=int, default=1,
+                        help='Shortest word kept (default: 1)')
+    parser.add_argument('--max-length', type=int, default=15,
+                        help='Longest word kept (default: 15)')
+    parser.add_argument('--quotes', type=int, default=1000,
+                        help='Quotes kept, 0 for no quote file (default: 1000)')
+    parser.add_argument('-j', '--processes', type=int, default=None,
+                        help='Worker processes (default: one per core)')
+    parser.add_argument('-o', '--output-dir', type=str, default=WORD_LIST_DIR,
+                        help='Where to write the lists (default: data/word_lists)')
+    args = parser.parse_args()
+
+    if not SOURCE_NAME.match(args.name):
+        parser.error("the name may only contain letters, digits, '_' and '-'")
+
+    started = time.perf_counter()
+    def progress(done):
+        print(f"\r{done / 1024 / 1024:10,.0f} MiB read", end="", file=sys.stderr, flush=True)
+
+    counts, candidates, size = build(args.sources, args.processes, args.quotes > 0, progress=progress)
+    print(file=sys.stderr)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    words = rank(counts, args.top, args.min_count, args.min_length, args.max_length)
+    if not words:
+        print("No words found in the sources.", file=sys.stderr)
+        return 1
+    words_path = os.path.join(args.output_dir, f"{args.name}.txt")
+    write_atomic(words_path, "\n".join(words) + "\n")
+    print(f"{len(words):,} words ({len(counts):,} distinct seen) -> {words_path}")
+
+    if args.quotes:
+        quotes = list(dict.fromkeys(candidates))  # Drop repeats, keep the order
+        quotes = random.sample(quotes, min(args.quotes, len(quotes)))
+        if quotes:
+            quotes_path = os.path.join(args.output_dir, f"{args.name}-quotes.txt")
+            write_atomic(quotes_path, "\n\n".join(quotes) + "\n")
+            print(f"{len(quotes):,} quotes -> {quotes_path}")
+
+    elapsed = time.perf_counter() - started
+    print(f"{size / 1024 / 1024:,.0f} MiB in {elapsed:.1f}s ({size / 1024 / 1024 / elapsed:,.0f} MiB/s)")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,77 @@
+"""
+File cache module - process-wide caches of indexes built from files
+"""
+
+import mmap
+import os
+import threading
+
+_lock = threading.Lock()
+_loading = {}
+"""Paths being loaded right now -> event set when the load is done"""
+
+def load_cached(cache, path, stat, load):
+    """Return ``cache[path]`` when it was built from the file with ``stat``, else ``load()`` it.
+
+    A changed file replaces the cached item. Only one thread loads a path at
+    a time. Others asking for it meanwhile wait for that load instead of
+    repeating it, so a warm-up thread and the session never build the same
+    index twice.
+    """
+    while True:
+        with _lock:
+            item = cache.get(path)
+            if item is not None and item.matches(stat):
+                return item
+            loading = _loading.get(path)
+            if loading is None:
+                loading = _loading[path] = threading.Event()
+                break
+        loading.wait()  # Then use its result, or take over if it failed
+
+    try:
+        item = load()
+        with _lock:
+            # A stale item isn't closed, samplers, prefetch threads and other
+            # sessions may still read it. Its mmap goes with the last reference.
+            cache[path] = item
+        return item
+    finally:
+        with _lock:
+            del _loading[path]
+        loading.set()
+
+def open_sidecar(path, header, magic, version, stat):
+    """Memory-map a sidecar index, or return None if it is missing or stale.
+
+    ``header`` is the sidecar's struct, starting with the magic, the
+    version and the mtime_ns and size of the file it was built from, which
+    must match ``stat``.
+    """
+    try:
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        return None
+
+    fields = header.unpack_from(buffer)[:4] if len(buffer) >= header.size else None
+    if fields != (magic, version, stat.st_mtime_ns, stat.st_size):
+        buffer.close()
+        return None
+    return buffer
+
+def write_sidecar(path, data):
+    """Atomically write a sidecar file, ignoring failures like a read-only install.
+
+    The temporary name is unique per thread, as well as per process.
+    """
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(temp_path, 'wb') as f:
+            f.write(data)
+        os.replace(temp_path, path)
+    except OSError:
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
@@ -0,0 +1,23 @@
+"""
+Lazy exports module - package attributes imported on first use
+"""
+
+from importlib import import_module
+import sys
+
+def lazy_exports(package, exports):
+    """Return a module ``__getattr__`` importing ``exports`` on first use.
+
+    ``exports`` maps each name to the module it's defined in, relative to
+    ``package``. A name is imported once, then kept in the package's globals.
+
+        __getattr__ = lazy_exports(__name__, {"TypingSession": ".typing_session"})
+    """
+    def __getattr__(name):
+        if name not in exports:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(import_module(exports[name], package), name)
+        setattr(sys.modules[package], name, value)
+        return value
+
+    return __getattr__
@@ -0,0 +1,147 @@
+"""
+Quote index module - random access to quotes by byte offset and length
+"""
+
+from array import array
+import bisect
+import mmap
+import os
+import random
+import struct
+
+# Import custom modules
+from utils.file_cache import load_cached, open_sidecar, write_sidecar
+
+QUOTE_INDEX_MAGIC = b"STQI"
+QUOTE_INDEX_VERSION = 1
+QUOTE_INDEX_HEADER = struct.Struct("<4sIqqII")  # magic, version, source mtime_ns, source size, quotes, buckets
+
+LENGTH_BUCKETS = (100, 300, 600)
+"""Upper bounds in characters of the short, medium and long buckets, longer quotes go in a fourth"""
+
+CHARS_PER_SECOND = 5
+"""Typing speed a quote is sized for, 60 WPM"""
+
+_quote_cache = {}
+"""Process-wide cache of opened quote indexes, keyed by source path"""
+
+def bucket_for_length(length):
+    """Length bucket of a quote of ``length`` characters."""
+    return bisect.bisect_left(LENGTH_BUCKETS, length)
+
+def bucket_for_time(time_limit):
+    """Length bucket of quotes that fit in a ``time_limit`` second test."""
+    return bucket_for_length(time_limit * CHARS_PER_SECOND)
+
+def scan_quotes(f):
+    """Yield (byte offset, byte length, characters) of the blank-line separated quotes in ``f``."""
+    offset = 0
+    start = None
+    words = []
+    for line in f:
+        if line.strip():
+            if start is None:
+                start = offset
+            words += line.split()
+        elif start is not None:
+            yield start, offset - start, len(b" ".join(words).decode(errors="replace"))
+            start, words = None, []
+        offset += len(line)
+
+    if start is not None:
+        yield start, offset - start, len(b" ".join(words).decode(errors="replace"))
+
+def build_quote_index(f, stat):
+    """Serialize the quotes in the binary file ``f`` into the quote index format.
+
+    The index is a header, the uint64 offsets and uint32 byte lengths of the
+    quotes grouped by bucket, then ``buckets + 1`` uint32 bucket starts.
+    """
+    buckets = [([], []) for _ in range(len(LENGTH_BUCKETS) + 1)]
+    for offset, length, chars in scan_quotes(f):
+        offsets, lengths = buckets[bucket_for_length(chars)]
+        offsets.append(offset)
+        lengths.append(length)
+
+    starts = array('I', [0])
+    offsets, lengths = array('Q'), array('I')
+    for bucket_offsets, bucket_lengths in buckets:
+        offsets.extend(bucket_offsets)
+        lengths.extend(bucket_lengths)
+        starts.append(len(offsets))
+
+    header = QUOTE_INDEX_HEADER.pack(QUOTE_INDEX_MAGIC, QUOTE_INDEX_VERSION, stat.st_mtime_ns,
+                                     stat.st_size, len(offsets), len(buckets))
+    return header + offsets.tobytes() + lengths.tobytes() + starts.tobytes()
+
+class QuoteIndex:
+    """Byte offsets of the quotes in a quotes file, grouped by length bucket.
+
+    Drawing a quote picks a random entry of a bucket and reads just that
+    quote with one seek and read, so the quotes file is never loaded whole.
+    The index lives in a ``<file>.qidx`` sidecar built by a single streaming
+    pass, and is rebuilt when the file's mtime or size changes.
+    """
+
+    def __init__(self, path, buffer):
+        self.path = path
+        self.buffer = buffer
+        _, _, self.mtime_ns, self.size, self.quotes, buckets = QUOTE_INDEX_HEADER.unpack_from(buffer)
+
+        view = memoryview(buffer)
+        position = QUOTE_INDEX_HEADER.size
+        self.offsets = view[position:position + self.quotes * 8].cast('Q')
+        position += self.quotes * 8
+        self.lengths = view[position:position + self.quotes * 4].cast('I')
+        position += self.quotes * 4
+        self.starts = view[position:position + (buckets + 1) * 4].cast('I')
+
+    def __len__(self):
+        return self.quotes
+
+    def matches(self, stat):
+        """Whether the index was built from the file with this stat."""
+        return self.mtime_ns == stat.st_mtime_ns and self.size == stat.st_size
+
+    def bucket_range(self, bucket):
+        """Entry range of ``bucket``, or of the nearest non-empty bucket."""
+        buckets = len(self.starts) - 1
+        for distance in range(buckets):
+            for candidate in (bucket - distance, bucket + distance):
+                if 0 <= candidate < buckets and self.starts[candidate] < self.starts[candidate + 1]:
+                    return self.starts[candidate], self.starts[candidate + 1]
+        return 0, self.quotes
+
+    def read(self, i):
+        """Read quote ``i`` from the quotes file, whitespace normalized."""
+        with open(self.path, 'rb') as f:
+            f.seek(self.offsets[i])
+            data = f.read(self.lengths[i])
+        return " ".join(data.decode(errors="replace").split())
+
+    def sample(self, bucket=None):
+        """Read a random quote, from ``bucket`` when given."""
+        start, end = self.bucket_range(bucket) if bucket is not None else (0, self.quotes)
+        return self.read(random.randrange(start, end))
+
+    def close(self):
+        self.starts.release()
+        self.offsets.release()
+        self.lengths.release()
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+
+def load_quote_index(path):
+    """Return the QuoteIndex of a quotes file, building its sidecar when missing or stale."""
+    stat = os.stat(path)
+
+    def load():
+        index_path = path + ".qidx"
+        data = open_sidecar(index_path, QUOTE_INDEX_HEADER, QUOTE_INDEX_MAGIC, QUOTE_INDEX_VERSION, stat)
+        if data is None:
+            with open(path, 'rb') as f:
+                data = build_quote_index(f, stat)
+            write_sidecar(index_path, data)  # Kept in memory only if it can't be written
+        return QuoteIndex(path, data)
+
+    return load_cached(_quote_cache, path, stat, load)
@@ -2,51 +2,215 @@
 Word list loader module - handles loading and processing word lists
 """
 
+from array import array
+import mmap
 import os
 import random
+import re
+import struct
+import threading
 
-def word_list(word_source="common"):
-    """Load the word list based on the selected source."""
-    script_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Import custom modules
+from utils.file_cache import load_cached, open_sidecar, write_sidecar
 
-    WORD_LISTS = {
-        "common": os.path.join(script_dir, "data/word_lists/common.txt"),
-        "programming": os.path.join(script_dir, "data/word_lists/programming.txt"),
-        "quotes": os.path.join(script_dir, "data/word_lists/quotes.txt")
-    }
+SCRIPT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
-    try:
-        file_path = WORD_LISTS.get(word_source, WORD_LISTS["common"])
-        words_dir = os.path.dirname(file_path)
+WORD_LIST_DIR = os.path.join(SCRIPT_DIR, "data/word_lists")
+
+WORD_LISTS = {
+    "common": os.path.join(SCRIPT_DIR, "data/word_lists/common.txt"),
+    "programming": os.path.join(SCRIPT_DIR, "data/word_lists/programming.txt"),
+    "quotes": os.path.join(SCRIPT_DIR, "data/word_lists/quotes.txt")
+}
+
+SOURCE_NAME = re.compile(r"^[\w-]+$")
+"""Names of word sources, other lists are <name>.txt files in WORD_LIST_DIR"""
+
+FALLBACK_WORDS = ["the", "be", "to", "of", "and", "a", "in", "that", "have", "I"]
+
+MAX_WORDS = 100
+
+ADAPTIVE_SOURCE = "common"
+"""Corpus the "adaptive" word source draws from"""
+
+INDEX_MAGIC = b"STWL"
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct("<4sIqqI")  # magic, version, source mtime_ns, source size, entries
+
+_corpus_cache = {}
+"""Process-wide cache of loaded corpora, keyed by source path"""
+
+class Corpus:
+    """Tokenized word list backed by a binary index.
+
+    The index is a header, ``entries + 1`` uint32 offsets and the UTF-8 entries
+    back to back, so an entry is read by slicing without parsing the rest of
+    the file. Quotes have their own index, see ``utils.quote_index``.
+    """
+
+    def __init__(self, buffer):
+        self.buffer = buffer
+        _, _, self.mtime_ns, self.size, self.entries = INDEX_HEADER.unpack_from(buffer)
+
+        offsets_end = INDEX_HEADER.size + (self.entries + 1) * 4
+        self.offsets = memoryview(buffer)[INDEX_HEADER.size:offsets_end].cast('I')
+        self.data_start = offsets_end
+
+    def __len__(self):
+        return self.entries
 
-        # Create directory if it doesn't exist
-        if not os.path.exists(words_dir):
-            os.makedirs(words_dir, exist_ok=True)
+    def __getitem__(self, i):
+        start = self.data_start + self.offsets[i]
+        end = self.data_start + self.offsets[i + 1]
+        return bytes(self.buffer[start:end]).decode()
 
+    def matches(self, stat):
+        """Whether the corpus was built from the file with this stat."""
+        return self.mtime_ns == stat.st_mtime_ns and self.size == stat.st_size
+
+    def sample(self, k):
+        """Draw up to ``k`` distinct entries at random."""
+        return [self[i] for i in random.sample(range(self.entries), min(k, self.entries))]
+
+    def close(self):
+        self.offsets.release()
+        if isinstance(self.buffer, mmap.mmap):
+            self.buffer.close()
+
+def tokenize(content):
+    """Split a word list file into its words."""
+    return content.split()
+
+def build_index(entries, stat):
+    """Serialize entries into the binary index format."""
+    encoded = [entry.encode() for entry in entries]
+
+    offsets = array('I', [0])
+    for entry in encoded:
+        offsets.append(offsets[-1] + len(entry))
+
+    header = INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, stat.st_mtime_ns, stat.st_size, len(encoded))
+    return header + offsets.tobytes() + b"".join(encoded)
+
+def is_quote_source(word_source):
+    """Whether a word source is made of quotes: "quotes", or a built "<name>-quotes" list."""
+    return word_source == "quotes" or word_source.endswith("-quotes")
+
+def available_sources():
+    """Names of the word sources: the bundled ones, "adaptive" and lists in WORD_LIST_DIR."""
+    sources = list(WORD_LISTS) + ["adaptive"]
+    try:
+        entries = sorted(os.listdir(WORD_LIST_DIR))
+    except FileNotFoundError:
+        entries = []
+    for entry in entries:
+        name, extension = os.path.splitext(entry)
+        if extension == ".txt" and SOURCE_NAME.match(name) and name not in sources:
+            sources.append(name)
+    return sources
+
+def word_list_path(word_source):
+    """Path of a word source's file, written with the defaults if it doesn't exist."""
+    file_path = WORD_LISTS.get(word_source)
+    if file_path is None:
+        # Lists built with utils.corpus_builder, or dropped in by hand
+        file_path = os.path.join(WORD_LIST_DIR, f"{word_source}.txt")
+        if SOURCE_NAME.match(word_source) and os.path.exists(file_path):
+            return file_path
+        word_source = "quotes" if is_quote_source(word_source) else "common"
+        file_path = WORD_LISTS[word_source]
+
+    if not os.path.exists(file_path):
         # Create default word lists if they don't exist
-        if not os.path.exists(file_path):
-            create_default_word_list(file_path, word_source)
-
-        with open(file_path, 'r') as f:
-            content = f.read()
-
-        if word_source == "quotes":
-            # Split the quotes file into individual quotes
-            quotes = [q.strip() for q in content.split('\n\n') if q.strip()]
-            # Choose a random quote
-            return random.choice(quotes).split()
-        else:
-            word_list = content.split()
-            random.shuffle(word_list)
-            return word_list[:100]  # Limit to 100 words
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        create_default_word_list(file_path, word_source)
+    return file_path
+
+def load_quotes(word_source="quotes"):
+    """Return the QuoteIndex of a quotes list."""
+    from utils.quote_index import load_quote_index  # Only quote sources need it
+    return load_quote_index(word_list_path(word_source))
+
+def load_corpus(word_source="common"):
+    """Return the tokenized corpus for a word source.
+
+    Corpora are cached for the lifetime of the process and invalidated when
+    the file's mtime or size changes. On a cold cache the pre-tokenized
+    ``<file>.idx`` sidecar is memory-mapped; it is (re)built from the text
+    file only when missing or stale.
+    """
+    file_path = word_list_path(word_source)
+    stat = os.stat(file_path)
+
+    def load():
+        index_path = file_path + ".idx"
+        index = open_sidecar(index_path, INDEX_HEADER, INDEX_MAGIC, INDEX_VERSION, stat)
+        if index is None:
+            with open(file_path, 'r') as f:
+                index = build_index(tokenize(f.read()), stat)
+            write_sidecar(index_path, index)  # Kept in memory only if it can't be written
+        return Corpus(index)
+
+    return load_cached(_corpus_cache, file_path, stat, load)
+
+def warm_up(word_source="common"):
+    """Load a corpus into the cache in a background thread.
+
+    A session asking for it before it's ready waits for this load rather
+    than starting its own.
+    """
+    def load():
+        try:
+            if is_quote_source(word_source):
+                load_quotes(word_source)
+            else:
+                load_corpus(ADAPTIVE_SOURCE if word_source == "adaptive" else word_source)
+        except Exception:
+            pass  # word_list() reports the error when the session needs it
+
+    threading.Thread(target=load, daemon=True).start()
+
+def word_list(word_source="common", time_limit=None, errors=None):
+    """Load the word list based on the selected source.
+
+    For quotes, ``time_limit`` picks a quote of a length that suits the test.
+    Load failures fall back to basic words and are added to ``errors`` when
+    given, e.g. while curses owns the terminal, or printed otherwise.
+    """
+    try:
+        if word_source == "adaptive":
+            # Weighted towards the user's weak characters
+            from utils.adaptive_words import adaptive_sampler
+            return adaptive_sampler(ADAPTIVE_SOURCE).sample(MAX_WORDS)
+
+        if is_quote_source(word_source):
+            # Read one random quote of a suitable length from the quotes file
+            from utils.quote_index import bucket_for_time
+            quotes = load_quotes(word_source)
+            if not len(quotes):
+                return FALLBACK_WORDS[:]
+            bucket = bucket_for_time(time_limit) if time_limit is not None else None
+            return quotes.sample(bucket).split()
+
+        corpus = load_corpus(word_source)
+        if not len(corpus):
+            return FALLBACK_WORDS[:]
+        return corpus.sample(MAX_WORDS)  # Limit to 100 words
 
     except Exception as e:
-        print(f"Error loading word list: {e}")
+        message = f"Error loading word list: {e}"
+        if errors is None:
+            print(message)
+        elif message not in errors:
+            errors.append(message)  # Reported once, not for every batch
         # Fallback to basic words
-        return ["the", "be", "to", "of", "and", "a", "in", "that", "have", "I"]
+        return FALLBACK_WORDS[:]
 
 def create_default_word_list(file_path, word_source):
-    """Create default word lists for first-time users."""
+    """Create default word lists for first-time users.
+
+    Failures are raised, for word_list() to report.
+    """
 
     default_content = {
         "common": """the be to of and a in that have I it for not on with he as you do at this but his by from they we say her she or an will my one all would there their what so up out if about who get which go me when make can like time no just him know take people into year your good some could them see other than then now look only come its over think also back after use two how our work first well way even new want because any these give day most us""",
@@ -76,8 +240,5 @@ def create_default_word_list(file_path, word_source):
         """
     }
 
-    try:
-        with open(file_path, 'w') as f:
-            f.write(default_content.get(word_source, default_content["common"]))
-    except Exception as e:
-        print(f"Error creating default word list: {e}")
+    with open(file_path, 'w') as f:
+        f.write(default_content.get(word_source, default_content["common"]))
@@ -0,0 +1,91 @@
+"""
+Word stream module - endless, lazily extended word sequence for a session
+"""
+
+import threading
+
+from utils.word_list import word_list
+
+LOW_WATERMARK = 50
+"""Prefetch more words when fewer than this many are left ahead of the cursor"""
+
+KEEP_BEHIND = 20
+"""Words kept behind the cursor for display, older ones are dropped"""
+
+class WordStream:
+    """Endless sequence of words drawn from a word source.
+
+    Words are addressed by their absolute position in the session. Batches
+    from ``word_list()`` are appended in a background thread as the cursor gets
+    close to the end, and words that scrolled out of view are dropped, so
+    memory stays bounded however long the session runs.
+    """
+
+    def __init__(self, word_source="common", prefetch=True, time_limit=None, errors=None):
+        self.word_source = word_source
+        self.time_limit = time_limit  # Sizes quotes to the test
+        self.prefetch = prefetch
+        self.errors = errors  # Where load failures go instead of the terminal
+
+        self.buffer = []
+        self.offset = 0  # Absolute index of buffer[0]
+        self.lock = threading.Lock()
+        self.fetcher = None
+
+        self._fill()
+
+    def __len__(self):
+        """Number of words generated so far, including dropped ones."""
+        return self.offset + len(self.buffer)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start = max(index.start or 0, self.offset)
+            stop = index.stop if index.stop is not None else len(self)
+            self._ensure(stop - 1)
+            with self.lock:
+                return self.buffer[start - self.offset:stop - self.offset]
+
+        if index < self.offset:
+            raise IndexError(f"word {index} was dropped from the stream")
+        self._ensure(index)
+        with self.lock:
+            return self.buffer[index - self.offset]
+
+    def advance(self, index):
+        """Move the cursor to ``index``: drop old words and prefetch new ones."""
+        with self.lock:
+            drop = index - KEEP_BEHIND - self.offset
+            if drop > 0:
+                del self.buffer[:drop]
+                self.offset += drop
+
+        if len(self) - index < LOW_WATERMARK:
+            if self.prefetch:
+                self._prefetch()
+            else:
+                self._fill()
+
+    def _ensure(self, index):
+        """Block until the word at ``index`` exists."""
+        while index >= len(self):
+            if self.fetcher is not None:
+                self.fetcher.join()
+            if index >= len(self):
+                self._fill()
+
+    def _prefetch(self):
+        """Start fetching the next batch in the background, if not already."""
+        if self.fetcher is not None and self.fetcher.is_alive():
+            return
+        self.fetcher = threading.Thread(target=self._fill, daemon=True)
+        self.fetcher.start()
+
+    def _fill(self):
+        """Append at least LOW_WATERMARK words (whole quotes for quotes)."""
+        batch = []
+        while len(batch) < LOW_WATERMARK:
+            batch.extend(word_list(self.word_source, self.time_limit, self.errors))
+
+        with self.lock:
+            self.buffer.extend(batch)